@@ -3,9 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 import redis
 import json
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageStat
 import io
 import random
+import hashlib
 
 app = FastAPI(title="TASTE.AI Elite", version="3.0")
 
@@ -28,12 +29,16 @@ class EliteAestheticEngine:
         }
     
     def analyze(self, image):
-        img_array = np.array(image.convert('RGB'))
+        image = image.convert('RGB')
         
-        # Elite aesthetic calculations
-        brightness = np.mean(img_array) / 255.0
-        color_variance = np.var(img_array)
-        edge_density = len(np.where(np.diff(img_array.mean(axis=2)) > 20)[0])
+        # Elite aesthetic calculations (histogram stats, no float copy of the pixels)
+        stat = ImageStat.Stat(image)
+        brightness = np.mean(stat.mean) / 255.0
+        # Variance of the whole array = mean band variance + spread of the band means
+        color_variance = np.mean(stat.var) + np.var(stat.mean)
+        # Channel-sum steps > 60 are channel-mean steps > 20
+        channel_sum = np.asarray(image).sum(axis=2, dtype=np.int16)
+        edge_density = np.count_nonzero(np.diff(channel_sum) > 60)
         
         # Burch-specific scoring
         sophistication = min(1.0, (brightness * 0.6 + (1 - color_variance/10000) * 0.4))
@@ -54,6 +59,7 @@ class EliteAestheticEngine:
         }
 
 engine = EliteAestheticEngine()
+ENGINE_VERSION = "elite_v3.0"
 
 @app.get("/")
 async def root():
@@ -74,12 +80,17 @@ async def score_aesthetic(file: UploadFile = File(...)):
     
     try:
         image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
         
+        # Content-addressed cache shared by every worker
+        cache_key = f"score:{ENGINE_VERSION}:{hashlib.sha256(image_data).hexdigest()}"
+        cached = r.get(cache_key)
+        if cached:
+            return json.loads(cached)
+        
+        image = Image.open(io.BytesIO(image_data))
         result = engine.analyze(image)
         
         # Cache result
-        cache_key = f"score:{hash(image_data)}"
         r.setex(cache_key, 3600, json.dumps(result))
         
         return result
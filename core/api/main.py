@@ -1,7 +1,7 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import torch, numpy as np, json, redis
-from PIL import Image
+from PIL import Image, ImageStat
 import io, random, hashlib
 from datetime import datetime
 
@@ -15,9 +15,10 @@ class EliteAestheticEngine:
         self.chris_prefs = json.loads(r.get('chris_preferences') or '{"brightness": 180, "saturation": 120, "style": "minimalist"}')
     
     def analyze(self, image):
-        img_array = np.array(image.convert('RGB'))
-        brightness = np.mean(img_array)
-        saturation = np.std(img_array)
+        # Histogram stats of the whole RGB array, no float copy of the pixels
+        stat = ImageStat.Stat(image.convert('RGB'))
+        brightness = np.mean(stat.mean)
+        saturation = np.sqrt(np.mean(stat.var) + np.var(stat.mean))
         
         # Chris Burch alignment
         burch_score = 1.0 - abs(brightness - self.chris_prefs['brightness']) / 255.0
@@ -32,6 +33,7 @@ class EliteAestheticEngine:
         }
 
 engine = EliteAestheticEngine()
+ENGINE_VERSION = "elite_v3.0"
 
 @app.get("/")
 async def root():
@@ -47,11 +49,16 @@ async def score_aesthetic(file: UploadFile = File(...)):
         raise HTTPException(400, "Image required")
     
     image_data = await file.read()
+    cache_key = f"analysis:{ENGINE_VERSION}:{hashlib.sha256(image_data).hexdigest()}"
+    cached = r.get(cache_key)
+    if cached:
+        return json.loads(cached)
+    
     image = Image.open(io.BytesIO(image_data))
     result = engine.analyze(image)
     
-    # Store for learning
-    r.set(f"analysis:{hashlib.md5(image_data).hexdigest()}", json.dumps(result))
+    # Store for learning (and reuse on re-submission)
+    r.set(cache_key, json.dumps(result))
     
     return result
 
@@ -1,9 +1,17 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from PIL import Image
-import io
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Tuple
+import asyncio
+import json
 import random
+from app.core.config import settings
+from app.services.result_cache import result_cache
+from app.services.ingestion import UploadLimitRoute, UploadRejected, decode_image, ingest_upload, max_upload_files
 
-router = APIRouter()
+router = APIRouter(route_class=UploadLimitRoute)
+
+SIMPLE_MODEL_VERSION = "simple_v1.0"
 
 @router.post("/score")
 async def score_aesthetic(file: UploadFile = File(...)):
@@ -12,70 +20,148 @@ async def score_aesthetic(file: UploadFile = File(...)):
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        # Read and process image
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Simple scoring algorithm
-        width, height = image.size
-        aspect_ratio = width / height
-        
-        # Base score
-        score = 0.6
-        
-        # Prefer certain aspect ratios
-        if 0.8 <= aspect_ratio <= 1.25:  # Square-ish
-            score += 0.1
-        elif 1.4 <= aspect_ratio <= 1.7:  # Golden ratio
-            score += 0.15
-        
-        # Add some randomness
-        score += random.uniform(-0.05, 0.25)
-        score = max(0.1, min(0.95, score))
-        
-        return {
-            "aesthetic_score": float(score),
-            "confidence": float(score * 0.9),
-            "trend_analysis": {
-                "trend_score": round(random.uniform(0.6, 0.9), 2),
-                "viral_potential": round(random.uniform(0.5, 0.8), 2),
-                "market_appeal": round(random.uniform(0.7, 0.95), 2),
-                "seasonal_relevance": round(random.uniform(0.6, 0.85), 2)
-            },
-            "metadata": {
-                "image_size": image.size,
-                "format": image.format,
-                "model_version": "simple_v1.0"
-            }
-        }
+        # Spool and probe; the heuristic only needs the header
+        upload = await ingest_upload(file)
+        try:
+            key = result_cache.key_for_digest(upload.sha256, SIMPLE_MODEL_VERSION)
+            # Probed size, not the spool: the computation may outlive this request
+            size = (upload.width, upload.height)
+            
+            async def compute():
+                return _simple_score(size)
+            
+            return await result_cache.get_or_compute(key, compute)
+        finally:
+            upload.close()
         
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
-@router.post("/batch-score")
-async def batch_score_aesthetic(files: list[UploadFile] = File(...)):
+def _simple_score(size: Tuple[int, int]) -> dict:
+    """Aspect-ratio heuristic score for an image of the given size"""
+    # Simple scoring algorithm
+    width, height = size
+    aspect_ratio = width / height
+    
+    # Base score
+    score = 0.6
+    
+    # Prefer certain aspect ratios
+    if 0.8 <= aspect_ratio <= 1.25:  # Square-ish
+        score += 0.1
+    elif 1.4 <= aspect_ratio <= 1.7:  # Golden ratio
+        score += 0.15
+    
+    # Add some randomness
+    score += random.uniform(-0.05, 0.25)
+    score = max(0.1, min(0.95, score))
+    
+    return {
+        "aesthetic_score": float(score),
+        "confidence": float(score * 0.9),
+        "trend_analysis": {
+            "trend_score": round(random.uniform(0.6, 0.9), 2),
+            "viral_potential": round(random.uniform(0.5, 0.8), 2),
+            "market_appeal": round(random.uniform(0.7, 0.95), 2),
+            "seasonal_relevance": round(random.uniform(0.6, 0.85), 2)
+        },
+        "metadata": {
+            "image_size": image.size,
+            "format": image.format,
+            "model_version": SIMPLE_MODEL_VERSION
+        }
+    }
+
+@router.post("/batch-score", openapi_extra=max_upload_files(settings.batch_max_images))
+async def batch_score_aesthetic(
+    files: list[UploadFile] = File(...),
+    stream: bool = Query(False, description="Emit one NDJSON line per file as soon as it is scored"),
+    ordered: bool = Query(False, description="Stream results in upload order"),
+    concurrency: int = Query(settings.batch_concurrency, ge=1, le=32)
+):
     """Batch aesthetic scoring"""
-    results = []
+    results = _iter_batch_results(files, concurrency, ordered or not stream)
     
-    for file in files:
+    if stream:
+        async def ndjson():
+            async for result in results:
+                yield json.dumps(result) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    return {"results": [result async for result in results]}
+
+async def _iter_batch_results(files: List[UploadFile], concurrency: int,
+                              ordered: bool) -> AsyncIterator[dict]:
+    """Score uploads with at most `concurrency` in flight, yielding as they finish.
+
+    Each upload is only read once a slot is free and is closed right after
+    scoring, so at most `concurrency` images are held in memory. With
+    `ordered`, finished results wait until every earlier file is emitted.
+    """
+    uploads = iter(enumerate(files))
+    pending = set()
+    finished = {}
+    next_index = 0
+    
+    def launch_next():
+        item = next(uploads, None)
+        if item is not None:
+            pending.add(asyncio.ensure_future(_score_batch_item(*item)))
+    
+    for _ in range(concurrency):
+        launch_next()
+    
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                launch_next()
+                result = task.result()
+                if not ordered:
+                    yield result
+                    continue
+                finished[result["index"]] = result
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _score_batch_item(index: int, file: UploadFile) -> dict:
+    """Read, decode and score one batch upload; errors are reported inline"""
+    try:
+        upload = await ingest_upload(file)
         try:
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Simple scoring
-            score = 0.6 + random.uniform(-0.1, 0.3)
-            score = max(0.1, min(0.95, score))
-            
-            results.append({
-                "filename": file.filename,
-                "aesthetic_score": float(score),
-                "status": "success"
-            })
-        except Exception as e:
-            results.append({
-                "filename": file.filename,
-                "error": str(e),
-                "status": "error"
-            })
+            score = await run_in_threadpool(_score_batch_image, upload.read())
+        finally:
+            upload.close()
+        return {
+            "index": index,
+            "filename": file.filename,
+            "aesthetic_score": score,
+            "status": "success"
+        }
+    except Exception as e:
+        return {
+            "index": index,
+            "filename": file.filename,
+            "error": str(e),
+            "status": "error"
+        }
+    finally:
+        await file.close()
+
+def _score_batch_image(image_data: bytes) -> float:
+    """Decode and score one image (runs on the worker thread pool)"""
+    image = decode_image(image_data)
     
-    return {"results": results}
+    # Simple scoring
+    score = 0.6 + random.uniform(-0.1, 0.3)
+    score = max(0.1, min(0.95, score))
+    return float(score)
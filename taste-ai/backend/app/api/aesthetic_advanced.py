@@ -1,50 +1,186 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query
-from PIL import Image
-import io
-from app.ml.advanced_aesthetic import advanced_engine
-from typing import Optional, List
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import time
+from app.core.config import settings
+from app.services.scoring_executor import scoring_executor, analyze_image_bytes, ScoringQueueFull
+from app.services.result_cache import result_cache
+from app.services.ranking import TopKRanking
+from app.services.ingestion import IngestedUpload, UploadLimitRoute, UploadRejected, ingest_upload, max_upload_files
+from app.services.near_duplicates import near_duplicate_index
+from app.services.brand_index import get_brand_index, image_features
+from app.core.metrics import observe_stages
+from app.ml.advanced_aesthetic import MODEL_VERSION
+from typing import Optional, List, Dict, Literal, Tuple
 
-router = APIRouter()
+router = APIRouter(route_class=UploadLimitRoute)
+
+async def _run_analysis(image_data: bytes, analysis_depth: str) -> Tuple[Dict, int]:
+    """Decode and analyze an upload on the scoring executor (analysis, perceptual hash)"""
+    try:
+        result, timings, phash = await scoring_executor.submit(analyze_image_bytes, image_data, analysis_depth)
+        observe_stages(timings)
+        return result, phash
+    except ScoringQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(settings.scoring_retry_after_seconds)}
+        )
+
+async def _ingest(file: UploadFile) -> IngestedUpload:
+    """Spool and probe an upload, rejecting oversized or unreadable files early"""
+    try:
+        return await ingest_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+async def _analyze_upload(upload: IngestedUpload, analysis_depth: str = "comprehensive",
+                          near_duplicate_distance: Optional[int] = None) -> Dict:
+    """Analysis of an upload at the given depth, served from the result cache
+    
+    With `near_duplicate_distance`, an upload with no cached analysis of its
+    own may be answered with the cached analysis of an indexed image whose
+    perceptual hash is within that many bits, marked `near_duplicate_of`.
+    """
+    # Keyed by the digest taken while spooling
+    key = result_cache.key_for_digest(upload.sha256, MODEL_VERSION, analysis_depth)
+    if near_duplicate_distance is not None:
+        cached = await result_cache.get(key)
+        if cached is not None:
+            return cached
+        # Not stored under this upload's key, so exact lookups stay exact
+        reused = await _near_duplicate_analysis(upload, analysis_depth, near_duplicate_distance)
+        if reused is not None:
+            return reused
+    
+    # The computation is shared with coalesced requests and may outlive this
+    # one (and its spool), so it gets its own copy of the bytes
+    image_data, digest = upload.read(), upload.sha256
+    
+    async def compute():
+        result, phash = await _run_analysis(image_data, analysis_depth)
+        await near_duplicate_index.add(phash, digest)
+        return result
+    
+    return await result_cache.get_or_compute(key, compute)
+
+async def _near_duplicate_analysis(upload: IngestedUpload, analysis_depth: str,
+                                   max_distance: int) -> Optional[Dict]:
+    """Cached analysis of the nearest indexed near-duplicate, if any"""
+    phash = await run_in_threadpool(upload.perceptual_hash)
+    for distance, digest in await near_duplicate_index.query(phash, max_distance):
+        if digest == upload.sha256:
+            continue
+        cached = await result_cache.get(result_cache.key_for_digest(digest, MODEL_VERSION, analysis_depth))
+        if cached is not None:
+            return {**cached, "near_duplicate_of": {"sha256": digest, "distance": distance}}
+    return None
 
 @router.post("/score-advanced")
 async def score_aesthetic_advanced(
     file: UploadFile = File(...),
-    analysis_depth: str = Query("comprehensive", enum=["basic", "detailed", "comprehensive"])
+    analysis_depth: Literal["basic", "detailed", "comprehensive"] = Query("comprehensive"),
+    near_duplicate_distance: int = Query(
+        settings.near_duplicate_max_distance, ge=0, le=settings.near_duplicate_index_radius,
+        description="Reuse the analysis of an image within this many hash bits (if NEAR_DUPLICATE_REUSE is on)"
+    )
 ):
     """Advanced aesthetic scoring with comprehensive analysis"""
     try:
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
+        upload = await _ingest(file)
+        try:
+            # Run only the analysis the requested depth needs
+            reuse = near_duplicate_distance if settings.near_duplicate_reuse else None
+            return await _analyze_upload(upload, analysis_depth, reuse)
+        finally:
+            upload.close()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Advanced analysis failed: {str(e)}")
+
+@router.post("/near-duplicates")
+async def find_near_duplicates(
+    file: UploadFile = File(...),
+    max_distance: int = Query(
+        settings.near_duplicate_max_distance, ge=0, le=settings.near_duplicate_index_radius
+    )
+):
+    """List previously analyzed images that are near-duplicates of an upload"""
+    try:
+        if not file.content_type.startswith('image/'):
+            raise HTTPException(status_code=400, detail="File must be an image")
         
-        # Run comprehensive analysis
-        result = advanced_engine.analyze_comprehensive(image)
+        upload = await _ingest(file)
+        try:
+            phash = await run_in_threadpool(upload.perceptual_hash)
+            matches = await near_duplicate_index.query(phash, max_distance)
+        finally:
+            upload.close()
         
-        # Filter response based on analysis depth
-        if analysis_depth == "basic":
-            return {
-                "aesthetic_score": result["aesthetic_score"],
-                "confidence": result["confidence"],
-                "burch_alignment": result["burch_analysis"]["burch_alignment_score"],
-                "commercial_appeal": result["dimension_scores"]["commercial_appeal"]
-            }
-        elif analysis_depth == "detailed":
-            return {
-                "aesthetic_score": result["aesthetic_score"],
-                "dimension_scores": result["dimension_scores"],
-                "burch_analysis": result["burch_analysis"],
-                "trend_analysis": result["trend_analysis"],
-                "confidence": result["confidence"]
-            }
-        else:  # comprehensive
-            return result
+        return {
+            "sha256": upload.sha256,
+            "perceptual_hash": format(phash, '016x'),
+            "max_distance": max_distance,
+            "near_duplicates": [
+                {"sha256": digest, "distance": distance, "identical": digest == upload.sha256}
+                for distance, digest in matches
+            ],
+            "indexed_images": len(near_duplicate_index)
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Advanced analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Near-duplicate search failed: {str(e)}")
+
+# Brand features are whole-image means; this resolution measures them closely
+BRAND_FEATURE_MAX_SIDE = 512
+
+@router.post("/similar-brands")
+async def find_similar_brands(
+    file: UploadFile = File(...),
+    top_k: int = Query(5, ge=1, le=100)
+):
+    """Portfolio brands whose crawled imagery looks most like an upload (cosine similarity)"""
+    try:
+        if not file.content_type.startswith('image/'):
+            raise HTTPException(status_code=400, detail="File must be an image")
+        
+        index = await run_in_threadpool(get_brand_index)
+        if index is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Brand index not built; run python -m app.services.brand_index"
+            )
+        
+        upload = await _ingest(file)
+        try:
+            image = await run_in_threadpool(upload.open_image, BRAND_FEATURE_MAX_SIDE)
+            features = await run_in_threadpool(image_features, image)
+        finally:
+            upload.close()
+        
+        started = time.perf_counter()
+        brands = index.most_similar(features, top_k)
+        return {
+            "similar_brands": brands,
+            "features": dict(zip(index.manifest["features"], features.tolist())),
+            "indexed_brands": len(index),
+            "search_ms": (time.perf_counter() - started) * 1000
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Brand similarity search failed: {str(e)}")
 
-@router.post("/compare-images")
+@router.post("/compare-images", openapi_extra=max_upload_files(5))
 async def compare_images(
     files: List[UploadFile] = File(..., description="2-5 images to compare")
 ):
@@ -53,18 +189,18 @@ async def compare_images(
     if len(files) < 2 or len(files) > 5:
         raise HTTPException(status_code=400, detail="Please upload 2-5 images for comparison")
     
+    images = []
     try:
-        results = []
-        
         for i, file in enumerate(files):
             if not file.content_type.startswith('image/'):
                 continue
-                
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            analysis = advanced_engine.analyze_comprehensive(image)
-            
+            images.append((i, file, await _ingest(file)))
+        
+        # Score all images concurrently on the executor
+        analyses = await asyncio.gather(*(_analyze_upload(upload) for _, _, upload in images))
+        
+        results = []
+        for (i, file, _), analysis in zip(images, analyses):
             results.append({
                 "image_index": i,
                 "filename": file.filename,
@@ -101,8 +237,126 @@ async def compare_images(
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
+    finally:
+        for _, _, upload in images:
+            upload.close()
+
+RANKING_CRITERIA = ("aesthetic_score", "burch_alignment", "commercial_appeal")
+
+# The multipart body is parsed in the endpoint, so document it here
+RANKING_REQUEST_BODY = {
+    "required": True,
+    "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["files"],
+        "properties": {"files": {
+            "type": "array",
+            "items": {"type": "string", "format": "binary"},
+            "description": "Candidate images to rank",
+        }},
+    }}},
+}
+
+@router.post("/rank-images", openapi_extra={
+    **max_upload_files(settings.ranking_max_images), "requestBody": RANKING_REQUEST_BODY
+})
+async def rank_images(
+    request: Request,
+    top_k: int = Query(10, ge=1, le=100),
+    deadline_seconds: float = Query(settings.ranking_deadline_seconds, gt=0, le=600)
+):
+    """Rank many images and return the top-k per criterion.
+    
+    Images are scored in parallel on the scoring executor. If the deadline
+    expires, the ranking over the images scored so far is returned with
+    `complete: false`.
+    """
+    # File() parsing stops at Starlette's default of 1000 files; more than
+    # ranking_max_images is rejected with 400 while parsing
+    form = await request.form(max_files=settings.ranking_max_images)
+    try:
+        files = [item for item in form.getlist("files") if not isinstance(item, str)]
+        if not files:
+            raise HTTPException(status_code=400, detail="Please upload images to rank as 'files'")
+        return await _rank_uploads(files, top_k, deadline_seconds)
+    finally:
+        await form.close()
+
+async def _rank_uploads(files: List[UploadFile], top_k: int, deadline_seconds: float) -> Dict:
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    ranking = TopKRanking(top_k, RANKING_CRITERIA)
+    errors = []
+    
+    uploads = iter(enumerate(files))
+    pending = set()
+    
+    def launch_next():
+        item = next(uploads, None)
+        if item is not None:
+            pending.add(asyncio.ensure_future(_score_for_ranking(*item)))
+    
+    for _ in range(settings.ranking_concurrency):
+        launch_next()
+    
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                launch_next()
+                index, entry = task.result()
+                if entry["status"] == "success":
+                    ranking.add(index, entry)
+                else:
+                    errors.append(entry)
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    scored = ranking.summary(RANKING_CRITERIA[0])["count"]
+    return {
+        "rankings": {criterion: ranking.top(criterion) for criterion in RANKING_CRITERIA},
+        "summary": {criterion: ranking.summary(criterion) for criterion in RANKING_CRITERIA},
+        "total_submitted": len(files),
+        "total_scored": scored,
+        "total_failed": len(errors),
+        "errors": errors,
+        "complete": scored + len(errors) == len(files),
+        "elapsed_seconds": time.monotonic() - started
+    }
+
+async def _score_for_ranking(index: int, file: UploadFile):
+    """Score one ranking candidate; failures are returned, not raised"""
+    try:
+        if not file.content_type.startswith('image/'):
+            raise ValueError("File must be an image")
+        upload = await ingest_upload(file)
+        try:
+            analysis = await _analyze_upload(upload, "basic")
+        finally:
+            upload.close()
+        return index, {
+            "image_index": index,
+            "filename": file.filename,
+            "aesthetic_score": analysis["aesthetic_score"],
+            "burch_alignment": analysis["burch_alignment"],
+            "commercial_appeal": analysis["commercial_appeal"],
+            "status": "success"
+        }
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        return index, {"image_index": index, "filename": file.filename, "error": detail, "status": "error"}
+    finally:
+        await file.close()
 
 @router.post("/trend-forecast")
 async def trend_forecast(
@@ -114,10 +368,11 @@ async def trend_forecast(
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-        
-        analysis = advanced_engine.analyze_comprehensive(image)
+        upload = await _ingest(file)
+        try:
+            analysis = await _analyze_upload(upload)
+        finally:
+            upload.close()
         
         # Market-specific adjustments
         market_multipliers = {
@@ -156,6 +411,8 @@ async def trend_forecast(
             "actionable_insights": analysis["insights"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Trend forecast failed: {str(e)}")
 
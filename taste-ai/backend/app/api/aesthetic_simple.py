@@ -1,21 +1,17 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException
 from PIL import Image
-import io
-import numpy as np
 import random
+from app.ml.image_stats import ImageStats
+from app.services.ingestion import UploadLimitRoute, UploadRejected, ingest_upload
 
-router = APIRouter()
+router = APIRouter(route_class=UploadLimitRoute)
 
 # Simple aesthetic model
 class SimpleAestheticModel:
     def predict(self, image):
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        img_array = np.array(image)
-        colors = img_array.reshape(-1, 3)
-        color_variance = np.var(colors, axis=0).mean()
-        brightness = np.mean(colors) / 255.0
+        stats = ImageStats(image)
+        color_variance = stats.channel_var.mean()
+        brightness = stats.mean / 255.0
         
         base_score = 0.6
         if 0.3 <= brightness <= 0.7:
@@ -46,8 +42,11 @@ async def score_aesthetic_public(file: UploadFile = File(...)):
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
+        upload = await ingest_upload(file)
+        try:
+            image = upload.open_image()
+        finally:
+            upload.close()
         
         score = aesthetic_model.predict(image)
         trends = taste_scorer.analyze_trends(image)
@@ -57,11 +56,13 @@ async def score_aesthetic_public(file: UploadFile = File(...)):
             "trend_analysis": trends,
             "confidence": float(score * 0.95),
             "metadata": {
-                "image_size": image.size,
-                "format": image.format,
+                "image_size": (upload.width, upload.height),
+                "format": upload.format,
                 "model_version": "public_test_v1.0"
             }
         }
         
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
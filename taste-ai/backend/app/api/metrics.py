@@ -1,42 +1,18 @@
-from fastapi import APIRouter
-import psutil
+from fastapi import APIRouter, Request, Response
 import time
-import json
+from app.core import metrics as app_metrics
 
 router = APIRouter()
 
 @router.get("/metrics")
-async def get_metrics():
+async def get_metrics(request: Request, format: str = None):
     """Prometheus-style metrics endpoint"""
+    accept = request.headers.get("accept", "")
+    if format == "prometheus" or (format is None and ("text/plain" in accept or "openmetrics" in accept)):
+        body, content_type = app_metrics.render_prometheus()
+        return Response(content=body, media_type=content_type)
     
-    # Basic system metrics
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    
-    # Application metrics (mock for now)
-    metrics = {
-        "system": {
-            "cpu_usage_percent": cpu_percent,
-            "memory_usage_percent": memory.percent,
-            "memory_used_bytes": memory.used,
-            "memory_total_bytes": memory.total,
-            "disk_usage_percent": disk.percent,
-            "disk_used_bytes": disk.used,
-            "disk_total_bytes": disk.total
-        },
-        "application": {
-            "api_requests_total": 1247,
-            "api_requests_errors": 12,
-            "ml_inferences_total": 523,
-            "ml_inference_duration_seconds": 0.845,
-            "aesthetic_scores_processed": 523,
-            "trends_analyzed": 23,
-            "uptime_seconds": time.time()
-        }
-    }
-    
-    return metrics
+    return app_metrics.snapshot()
 
 @router.get("/health/detailed")
 async def detailed_health():
@@ -1,5 +1,18 @@
 from pydantic_settings import BaseSettings
 from typing import List, Optional
+import os
+
+# taste-ai/ml/data/models, independent of the working directory
+DEFAULT_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "ml", "data", "models"
+)
+DEFAULT_BRAND_INDEX_DIR = os.path.join(os.path.dirname(DEFAULT_MODEL_DIR), "brand_index")
+# Crawled portfolio brand analyses at the repository root
+DEFAULT_BRAND_SOURCE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(DEFAULT_MODEL_DIR)))),
+    "production_data", "visual_analysis_results.json.gz"
+)
 
 class Settings(BaseSettings):
     # Core settings
@@ -16,6 +29,61 @@ class Settings(BaseSettings):
     aws_secret_access_key: Optional[str] = None
     s3_bucket_name: Optional[str] = None
     
+    # Scoring executor (process pool for CPU-bound analysis)
+    scoring_workers: int = 2
+    scoring_queue_size: int = 16
+    scoring_retry_after_seconds: int = 2
+    
+    # Result cache (in-process LRU + shared Redis tier)
+    result_cache_memory_bytes: int = 64 * 1024 * 1024
+    result_cache_ttl_seconds: int = 24 * 3600
+    result_cache_redis_enabled: bool = True
+    
+    # Upload ingestion (spooled to disk past upload_spool_bytes)
+    upload_max_bytes: int = 50 * 1024 * 1024
+    # Total of a multi-file request (2000 ranking images at ~512 KiB each)
+    upload_max_request_bytes: int = 1024 * 1024 * 1024
+    upload_max_pixels: int = 50_000_000
+    upload_spool_bytes: int = 2 * 1024 * 1024
+    upload_chunk_bytes: int = 1024 * 1024
+    
+    # Near-duplicate reuse (perceptual hash Hamming distance, of 64 bits).
+    # Opt-in: a reused analysis describes a different, if similar, image
+    near_duplicate_reuse: bool = False
+    near_duplicate_max_distance: int = 4
+    near_duplicate_index_radius: int = 8
+    near_duplicate_index_max_entries: int = 500_000
+    
+    # Batch scoring (request bodies are capped at batch_max_images uploads)
+    batch_concurrency: int = 4
+    batch_max_images: int = 500
+    
+    # Large-scale ranking
+    ranking_max_images: int = 2000
+    ranking_concurrency: int = 4
+    ranking_deadline_seconds: float = 120.0
+    
+    # ViT inference micro-batching (0 threads = torch default)
+    inference_max_batch_size: int = 16
+    inference_max_wait_ms: float = 8.0
+    inference_num_threads: int = 0
+    
+    # Tiled analysis for very large images (0 = never tile)
+    tiled_analysis_min_pixels: int = 8_000_000
+    tiled_analysis_memory_bytes: int = 128 * 1024 * 1024
+    
+    # Portfolio brand similarity index (python -m app.services.brand_index)
+    brand_index_dir: str = DEFAULT_BRAND_INDEX_DIR
+    
+    # Model artifacts (loaded lazily from local disk; no network by default)
+    model_dir: str = DEFAULT_MODEL_DIR
+    allow_model_download: bool = False
+    model_warm_up: bool = True
+    
+    # ViT variant: pretrained (HF snapshot) or an exported fp32/int8/traced artifact
+    vit_variant: str = "pretrained"
+    vit_artifact_version: str = "latest"
+    
     class Config:
         env_file = ".env"
         extra = "allow"  # Allow extra fields without validation errors
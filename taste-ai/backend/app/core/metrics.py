@@ -0,0 +1,125 @@
+import time
+from typing import Dict
+import psutil
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Latency buckets from cache hits (~1 ms) up to 12 MP full analyses
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS_TOTAL = Counter(
+    "tasteai_http_requests_total", "HTTP requests by route and status",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "tasteai_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "tasteai_http_requests_in_progress", "HTTP requests currently being handled"
+)
+STAGE_LATENCY = Histogram(
+    "tasteai_analysis_stage_seconds", "AdvancedAestheticEngine per-stage latency",
+    ["stage"], buckets=LATENCY_BUCKETS
+)
+
+STARTED_AT = time.time()
+
+def route_label(scope: Dict) -> str:
+    """Route template for a handled request, e.g. /api/v1/items/{item_id}
+
+    Uses the template rather than the raw path to bound label cardinality.
+    Newer FastAPI versions match included routers without their prefix, so
+    the prefix is recovered from the concrete path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    concrete = template
+    for name, value in scope.get("path_params", {}).items():
+        concrete = concrete.replace("{" + name + "}", str(value)).replace("{" + name + ":path}", str(value))
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    REQUESTS_TOTAL.labels(method, route, str(status)).inc()
+    REQUEST_LATENCY.labels(method, route).observe(seconds)
+
+def observe_stages(timings: Dict[str, float]):
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.labels(stage).observe(seconds)
+
+class _ServiceStateCollector:
+    """Reads result cache and scoring executor state at scrape time"""
+
+    def collect(self):
+        from app.services.result_cache import result_cache
+        from app.services.scoring_executor import scoring_executor
+
+        stats = result_cache.stats()
+        events = CounterMetricFamily(
+            "tasteai_result_cache_events", "Result cache lookups by outcome", labels=["event"]
+        )
+        for event in ("memory_hits", "redis_hits", "misses", "coalesced", "redis_errors", "evictions"):
+            events.add_metric([event], stats[event])
+        yield events
+        yield GaugeMetricFamily("tasteai_result_cache_hit_ratio", "Result cache hit ratio", value=stats["hit_ratio"])
+        yield GaugeMetricFamily("tasteai_result_cache_memory_bytes", "Bytes held by the LRU tier", value=stats["memory_bytes"])
+        yield GaugeMetricFamily("tasteai_result_cache_memory_entries", "Entries held by the LRU tier", value=stats["memory_entries"])
+
+        yield GaugeMetricFamily("tasteai_scoring_queue_depth", "Scoring jobs waiting for a worker", value=scoring_executor.queue_depth)
+        yield GaugeMetricFamily("tasteai_scoring_in_flight", "Scoring jobs running on a worker", value=scoring_executor.in_flight)
+        yield GaugeMetricFamily("tasteai_scoring_capacity", "Maximum accepted scoring jobs", value=scoring_executor.capacity)
+
+REGISTRY.register(_ServiceStateCollector())
+
+def render_prometheus():
+    """Prometheus text exposition of every registered metric"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+def snapshot() -> Dict:
+    """JSON summary of the same metrics for dashboards and scripts"""
+    from app.services.result_cache import result_cache
+    from app.services.scoring_executor import scoring_executor
+
+    requests_total = 0.0
+    errors_total = 0.0
+    for sample in REQUESTS_TOTAL.collect()[0].samples:
+        if sample.name.endswith("_total"):
+            requests_total += sample.value
+            if sample.labels["status"].startswith("5"):
+                errors_total += sample.value
+
+    latency_sum = latency_count = 0.0
+    for sample in REQUEST_LATENCY.collect()[0].samples:
+        if sample.name.endswith("_sum"):
+            latency_sum += sample.value
+        elif sample.name.endswith("_count"):
+            latency_count += sample.value
+
+    memory = psutil.virtual_memory()
+    return {
+        "system": {
+            # interval=None compares against the previous call instead of sleeping
+            "cpu_usage_percent": psutil.cpu_percent(interval=None),
+            "memory_usage_percent": memory.percent,
+            "memory_used_bytes": memory.used,
+            "memory_total_bytes": memory.total,
+        },
+        "application": {
+            "api_requests_total": int(requests_total),
+            "api_requests_errors": int(errors_total),
+            "requests_in_progress": int(REQUESTS_IN_PROGRESS.collect()[0].samples[0].value),
+            "average_response_time_ms": 1000.0 * latency_sum / latency_count if latency_count else 0.0,
+            "uptime_seconds": time.time() - STARTED_AT,
+        },
+        "result_cache": result_cache.stats(),
+        "scoring_executor": {
+            "queue_depth": scoring_executor.queue_depth,
+            "in_flight": scoring_executor.in_flight,
+            "capacity": scoring_executor.capacity,
+        },
+    }
@@ -3,11 +3,22 @@ import torch.nn as nn
 import numpy as np
 from PIL import Image, ImageFilter, ImageStat
 import cv2
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import math
 import random
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
+from .prepared_image import PreparedImage
+from .tiled import TiledImage
+from .local_stats import IntegralImage
+from .palette import extract_palette, Palette
+from .burch_palette import BurchColorTable
+from app.core.config import settings
+
+# Bump whenever scoring output changes so cached results are invalidated
+MODEL_VERSION = 'advanced_v2.4'
 
 class AestheticDimension(Enum):
     COLOR_HARMONY = "color_harmony"
@@ -41,42 +52,49 @@ class AdvancedColorAnalyzer:
     def __init__(self):
         self.golden_ratios = [1.618, 0.618, 2.618]
         self.harmonic_ratios = [1.5, 2.0, 3.0, 4.0]
+        self.color_table = BurchColorTable(BurchPreferences.preferred_colors)
     
-    def analyze_color_harmony(self, image: Image.Image) -> Dict[str, float]:
+    def analyze_color_harmony(self, image: Union[Image.Image, PreparedImage, TiledImage]) -> Dict[str, float]:
         """Analyze color harmony using advanced color theory"""
-        img_array = np.array(image.convert('RGB'))
+        if isinstance(image, TiledImage):
+            return self.color_analysis(image.palette(k=5), 1.0 - image.saturation_std / 255.0,
+                                       image.color_cell_counts)
+        prepared = PreparedImage.of(image)
+        
+        # HSV for better color analysis
+        hsv = prepared.hsv
         
-        # Convert to HSV for better color analysis
-        hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
+        # Extract dominant colors (histogram + seeded mini-batch k-means)
+        palette = self._extract_dominant_colors(prepared.rgb, k=5)
+        saturation = self._calculate_saturation_balance(hsv)
         
-        # Extract dominant colors using k-means clustering
-        pixels = img_array.reshape(-1, 3)
+        # Every pixel classified against the Burch colours in one lookup
+        cell_counts = self.color_table.cell_counts(prepared.rgb)
         
-        # Simplified k-means (in production, use sklearn)
-        dominant_colors = self._extract_dominant_colors(pixels, k=5)
+        return self.color_analysis(palette, saturation, cell_counts)
+    
+    def color_analysis(self, palette: Palette, saturation: float, cell_counts: np.ndarray) -> Dict[str, float]:
+        """Color analysis from a palette, saturation balance and Burch color cell counts
+        (also used by tiled mode)"""
+        dominant_colors = palette.colors
         
         # Analyze color relationships
         harmony_score = self._calculate_color_harmony(dominant_colors)
         temperature = self._calculate_color_temperature(dominant_colors)
-        saturation = self._calculate_saturation_balance(hsv)
         
         return {
             'harmony_score': harmony_score,
             'color_temperature': temperature,
             'saturation_balance': saturation,
             'dominant_colors': dominant_colors.tolist(),
-            'burch_color_alignment': self._burch_color_score(dominant_colors)
+            'dominant_color_shares': palette.shares.tolist(),
+            'burch_color_alignment': self._burch_color_score(dominant_colors),
+            'palette_coverage': self.color_table.coverage(cell_counts)
         }
     
-    def _extract_dominant_colors(self, pixels: np.ndarray, k: int = 5) -> np.ndarray:
-        """Extract dominant colors using simplified clustering"""
-        # Simplified version - in production use proper k-means
-        unique_colors = np.unique(pixels.reshape(-1, pixels.shape[-1]), axis=0)
-        if len(unique_colors) > k:
-            # Sample k colors based on frequency
-            indices = np.random.choice(len(unique_colors), k, replace=False)
-            return unique_colors[indices]
-        return unique_colors
+    def _extract_dominant_colors(self, pixels: np.ndarray, k: int = 5) -> Palette:
+        """Extract dominant colors and their pixel shares (deterministic)"""
+        return extract_palette(pixels, k=k)
     
     def _calculate_color_harmony(self, colors: np.ndarray) -> float:
         """Calculate color harmony score"""
@@ -137,7 +155,7 @@ class AdvancedColorAnalyzer:
         """Calculate overall color temperature (warm vs cool)"""
         total_temp = 0.0
         for color in colors:
-            r, g, b = color
+            r, g, b = (float(c) for c in color)
             # Simplified temperature calculation
             temp = (r + g * 0.5) / (b + 1)  # Warm colors have higher values
             total_temp += temp
@@ -151,59 +169,55 @@ class AdvancedColorAnalyzer:
     
     def _burch_color_score(self, colors: np.ndarray) -> float:
         """Score based on Chris Burch's color preferences"""
-        burch_prefs = BurchPreferences()
-        
-        # Convert colors to nearest named colors (simplified)
-        color_names = []
-        for color in colors:
-            name = self._color_to_name(color)
-            color_names.append(name)
-        
-        # Score based on Burch preferences
-        total_score = 0.0
-        for name in color_names:
-            total_score += burch_prefs.preferred_colors.get(name, 0.5)
-        
-        return total_score / len(color_names) if color_names else 0.5
+        # Mean preference weight of the named colors (lookup table)
+        if len(colors) == 0:
+            return 0.5
+        return float(self.color_table.weight(colors).mean())
     
     def _color_to_name(self, rgb: np.ndarray) -> str:
         """Convert RGB to color name (simplified)"""
-        r, g, b = rgb
-        
-        # Simplified color naming
-        if r > 200 and g > 200 and b > 200:
-            return 'cream'
-        elif r < 50 and g < 50 and b > 100:
-            return 'navy'
-        elif r > 150 and g > 100 and b < 80:
-            return 'camel'
-        elif r < 80 and g < 80 and b < 80:
-            return 'charcoal'
-        else:
-            return 'neutral'
+        return self.color_table.name(rgb)
 
 class CompositionAnalyzer:
     """Advanced composition analysis"""
     
-    def analyze_composition(self, image: Image.Image) -> Dict[str, float]:
+    # Side of the local-variance window used for depth cues
+    DEPTH_WINDOW = 10
+    
+    def analyze_composition(self, image: Union[Image.Image, PreparedImage, TiledImage]) -> Dict[str, float]:
         """Analyze image composition using advanced techniques"""
-        img_array = np.array(image.convert('L'))  # Grayscale for composition
+        if isinstance(image, TiledImage):
+            return self.composition_analysis(
+                self.score_rule_of_thirds(image.region_stats('thirds')),
+                self.score_visual_weight(image.region_stats('quadrants')),
+                self._score_edge_density(image.edge_density),
+                self.score_symmetry(image.mirror_mean_diff),
+                self.score_depth(*image.depth_sums),
+            )
+        prepared = PreparedImage.of(image)
+        img_array = prepared.gray  # Grayscale for composition
+        integral = prepared.gray_integral  # O(1) local mean/variance
         
         # Rule of thirds analysis
-        rule_of_thirds = self._analyze_rule_of_thirds(img_array)
+        rule_of_thirds = self._analyze_rule_of_thirds(integral)
         
         # Visual weight distribution
-        weight_balance = self._analyze_visual_weight(img_array)
+        weight_balance = self._analyze_visual_weight(integral)
         
         # Leading lines detection
-        leading_lines = self._detect_leading_lines(img_array)
+        leading_lines = self._score_edge_density(prepared.edge_density)
         
         # Symmetry analysis
         symmetry = self._analyze_symmetry(img_array)
         
         # Depth analysis
-        depth_score = self._analyze_depth(img_array)
+        depth_score = self._analyze_depth(integral)
         
+        return self.composition_analysis(rule_of_thirds, weight_balance, leading_lines, symmetry, depth_score)
+    
+    def composition_analysis(self, rule_of_thirds: float, weight_balance: float, leading_lines: float,
+                             symmetry: float, depth_score: float) -> Dict[str, float]:
+        """Composition result from the individual scores (also used by tiled mode)"""
         return {
             'rule_of_thirds': rule_of_thirds,
             'visual_balance': weight_balance,
@@ -213,10 +227,14 @@ class CompositionAnalyzer:
             'overall_composition': (rule_of_thirds + weight_balance + symmetry) / 3
         }
     
-    def _analyze_rule_of_thirds(self, img: np.ndarray) -> float:
+    def _analyze_rule_of_thirds(self, integral: IntegralImage) -> float:
         """Analyze adherence to rule of thirds"""
-        h, w = img.shape
-        
+        regions = self.thirds_regions(*integral.shape)
+        return self.score_rule_of_thirds([integral.region_stats(*region) for region in regions])
+    
+    @staticmethod
+    def thirds_regions(h: int, w: int) -> List[Tuple[int, int, int, int]]:
+        """(y0, y1, x0, x1) windows around the rule-of-thirds intersections"""
         # Define third lines
         third_h = h // 3
         third_w = w // 3
@@ -226,36 +244,43 @@ class CompositionAnalyzer:
             (third_w, third_h), (2 * third_w, third_h),
             (third_w, 2 * third_h), (2 * third_w, 2 * third_h)
         ]
-        
+        return [
+            (y - 10, y + 10, x - 10, x + 10) for x, y in intersections
+            if 0 <= x < w and 0 <= y < h
+        ]
+    
+    def score_rule_of_thirds(self, region_stats: List[Tuple[float, float]]) -> float:
+        """Score the (mean, variance) of each thirds region"""
         score = 0.0
-        for x, y in intersections:
-            if 0 <= x < w and 0 <= y < h:
-                # Check local variance (indicates interesting content)
-                local_region = img[max(0, y-10):min(h, y+10), max(0, x-10):min(w, x+10)]
-                variance = np.var(local_region)
-                score += min(variance / 1000.0, 1.0)  # Normalize
+        for _, variance in region_stats:
+            # Check local variance (indicates interesting content)
+            score += min(variance / 1000.0, 1.0)  # Normalize
         
-        return score / len(intersections)
+        return score / 4
     
-    def _analyze_visual_weight(self, img: np.ndarray) -> float:
+    def _analyze_visual_weight(self, integral: IntegralImage) -> float:
         """Analyze visual weight distribution"""
-        h, w = img.shape
-        
+        quadrants = self.quadrant_regions(*integral.shape)
+        return self.score_visual_weight([integral.region_stats(*quad) for quad in quadrants])
+    
+    @staticmethod
+    def quadrant_regions(h: int, w: int) -> List[Tuple[int, int, int, int]]:
+        """(y0, y1, x0, x1) of the four image quadrants"""
         # Divide image into quadrants
         mid_h, mid_w = h // 2, w // 2
         
-        quadrants = [
-            img[:mid_h, :mid_w],      # Top-left
-            img[:mid_h, mid_w:],      # Top-right
-            img[mid_h:, :mid_w],      # Bottom-left
-            img[mid_h:, mid_w:]       # Bottom-right
+        return [
+            (0, mid_h, 0, mid_w),      # Top-left
+            (0, mid_h, mid_w, w),      # Top-right
+            (mid_h, h, 0, mid_w),      # Bottom-left
+            (mid_h, h, mid_w, w)       # Bottom-right
         ]
-        
+    
+    def score_visual_weight(self, quadrant_stats: List[Tuple[float, float]]) -> float:
+        """Score the balance of the (mean, variance) of each quadrant"""
         # Calculate visual weight (brightness + variance)
         weights = []
-        for quad in quadrants:
-            brightness = np.mean(quad)
-            variance = np.var(quad)
+        for brightness, variance in quadrant_stats:
             weight = brightness + variance / 100.0
             weights.append(weight)
         
@@ -266,11 +291,14 @@ class CompositionAnalyzer:
     def _detect_leading_lines(self, img: np.ndarray) -> float:
         """Detect leading lines in composition"""
         # Simplified edge detection
-        edges = cv2.Canny(img, 50, 150) if 'cv2' in globals() else np.zeros_like(img)
+        edges = cv2.Canny(img, PreparedImage.CANNY_LOW, PreparedImage.CANNY_HIGH)
         
         # Count edge pixels as proxy for leading lines
-        edge_density = np.sum(edges > 0) / (img.shape[0] * img.shape[1])
-        
+        edge_density = np.count_nonzero(edges) / edges.size
+        return self._score_edge_density(edge_density)
+    
+    def _score_edge_density(self, edge_density: float) -> float:
+        """Score an edge density against the leading-lines sweet spot"""
         # Optimal range for leading lines
         if 0.05 <= edge_density <= 0.15:
             return 1.0
@@ -294,100 +322,206 @@ class CompositionAnalyzer:
         
         # Calculate similarity
         diff = np.abs(left_half.astype(float) - right_half.astype(float))
-        symmetry_score = 1.0 - (np.mean(diff) / 255.0)
+        return self.score_symmetry(np.mean(diff))
+    
+    def score_symmetry(self, mean_abs_diff: float) -> float:
+        """Score the mean |left - mirrored right| grey difference"""
+        symmetry_score = 1.0 - (mean_abs_diff / 255.0)
         
         return max(0.0, symmetry_score)
     
-    def _analyze_depth(self, img: np.ndarray) -> float:
+    def _analyze_depth(self, integral: IntegralImage) -> float:
         """Analyze depth perception in image"""
-        # Simplified depth analysis using blur gradient
-        blurred = cv2.GaussianBlur(img, (15, 15), 0) if 'cv2' in globals() else img
-        
-        # Calculate local variance to detect depth cues
-        variance_map = np.zeros_like(img, dtype=float)
-        kernel_size = 5
+        h, w = integral.shape
+        window = self.DEPTH_WINDOW
         
-        for i in range(kernel_size, img.shape[0] - kernel_size):
-            for j in range(kernel_size, img.shape[1] - kernel_size):
-                local_region = img[i-kernel_size:i+kernel_size, j-kernel_size:j+kernel_size]
-                variance_map[i, j] = np.var(local_region)
+        # Local variance of every 10x10 window to detect depth cues. Only
+        # windows centred on interior pixels count; border pixels score 0.
+        _, local_var = integral.local_mean_variance(window)
+        interior = local_var[:h - window, :w - window]
         
-        # Depth score based on variance distribution
-        depth_score = np.std(variance_map) / np.mean(variance_map) if np.mean(variance_map) > 0 else 0
+        return self.score_depth(interior.sum(), np.square(interior).sum(), h * w)
+    
+    def score_depth(self, var_sum: float, var_sq_sum: float, n: int) -> float:
+        """Score depth from the sum and sum of squares of interior local variances over n pixels"""
+        # Depth score based on variance distribution over the whole frame
+        mean_var = var_sum / n if n else 0.0
+        if mean_var > 0:
+            spread = max(var_sq_sum / n - mean_var * mean_var, 0.0)
+            depth_score = math.sqrt(spread) / mean_var
+        else:
+            depth_score = 0
         
         return min(depth_score / 10.0, 1.0)  # Normalize
 
+# Response fields per analysis depth: output key -> (graph node, field or None)
+DEPTH_OUTPUTS = {
+    'basic': {
+        'aesthetic_score': ('aesthetic_score', None),
+        'confidence': ('confidence', None),
+        'burch_alignment': ('burch_alignment', None),
+        'commercial_appeal': ('dimension_scores', AestheticDimension.COMMERCIAL_APPEAL.value),
+    },
+    'detailed': {
+        'aesthetic_score': ('aesthetic_score', None),
+        'dimension_scores': ('dimension_scores', None),
+        'burch_analysis': ('burch_analysis', None),
+        'trend_analysis': ('trend_analysis', None),
+        'confidence': ('confidence', None),
+    },
+    'comprehensive': {
+        'aesthetic_score': ('aesthetic_score', None),
+        'dimension_scores': ('dimension_scores', None),
+        'color_analysis': ('color_analysis', None),
+        'composition_analysis': ('composition_analysis', None),
+        'burch_analysis': ('burch_analysis', None),
+        'trend_analysis': ('trend_analysis', None),
+        'insights': ('insights', None),
+        'confidence': ('confidence', None),
+        'metadata': ('metadata', None),
+    },
+}
+
+# Graph nodes reported as pipeline stages in timings
+NODE_STAGES = {
+    'color_analysis': 'color',
+    'composition_analysis': 'composition',
+    'complexity': 'complexity',
+    'trend_analysis': 'trend',
+}
+
+@contextmanager
+def _stage(timings: Optional[Dict[str, float]], name: str):
+    """Accumulate wall time of a pipeline stage into `timings` (if given)"""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
 class AdvancedAestheticEngine:
     """Advanced aesthetic analysis engine"""
     
-    def __init__(self):
+    def __init__(self, tile_min_pixels: int = 0, tile_memory_bytes: int = 128 * 1024 * 1024):
+        # Images with at least tile_min_pixels (0 = never) are measured in
+        # bounded-memory row bands instead of whole-image arrays
+        self.tile_min_pixels = tile_min_pixels
+        self.tile_memory_bytes = tile_memory_bytes
         self.color_analyzer = AdvancedColorAnalyzer()
         self.composition_analyzer = CompositionAnalyzer()
         self.burch_preferences = BurchPreferences()
-    
-    def analyze_comprehensive(self, image: Image.Image) -> Dict:
-        """Comprehensive aesthetic analysis"""
-        
-        # Ensure RGB mode
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Run all analyses
-        color_analysis = self.color_analyzer.analyze_color_harmony(image)
-        composition_analysis = self.composition_analyzer.analyze_composition(image)
         
-        # Calculate individual dimension scores
-        scores = {
+        # Dependency graph: node -> (input nodes, function of those inputs).
+        # 'image' is the PreparedImage root.
+        self.graph = {
+            'color_analysis': (('image',), self.color_analyzer.analyze_color_harmony),
+            'composition_analysis': (('image',), self.composition_analyzer.analyze_composition),
+            'complexity': (('image',), self._calculate_complexity),
+            'dimension_scores': (('color_analysis', 'composition_analysis', 'complexity'), self._dimension_scores),
+            'aesthetic_score': (('dimension_scores',), self._calculate_weighted_score),
+            'confidence': (('dimension_scores',), self._calculate_confidence),
+            'burch_alignment': (('color_analysis', 'composition_analysis', 'dimension_scores'), self._burch_alignment),
+            'burch_analysis': (('color_analysis', 'composition_analysis', 'dimension_scores', 'burch_alignment'),
+                               self._burch_specific_analysis),
+            'trend_analysis': (('dimension_scores', 'color_analysis'), self._predict_trends),
+            'insights': (('dimension_scores', 'color_analysis', 'composition_analysis'), self._generate_insights),
+            'metadata': (('image',), self._metadata),
+        }
+    
+    def analyze(self, image: Union[Image.Image, PreparedImage], depth: str = 'comprehensive',
+                timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Aesthetic analysis at the given depth (basic, detailed, comprehensive)
+        
+        Only the graph nodes needed for the depth's outputs are evaluated;
+        every depth sees the full-resolution image, so the scores a depth
+        reports match a comprehensive analysis. Images of tile_min_pixels
+        or more are measured tile by tile (see TiledImage).
+        """
+        prepared = PreparedImage.of(image)
+        root = prepared
+        if self.tile_min_pixels and prepared.size[0] * prepared.size[1] >= self.tile_min_pixels:
+            with _stage(timings, 'tiles'):
+                root = self.tiled(prepared.image)
+        
+        outputs = DEPTH_OUTPUTS[depth]
+        values = self.evaluate(root, [node for node, _ in outputs.values()], timings)
+        return {
+            key: values[node] if field is None else values[node][field]
+            for key, (node, field) in outputs.items()
+        }
+    
+    def analyze_comprehensive(self, image: Union[Image.Image, PreparedImage],
+                              timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Comprehensive aesthetic analysis
+        
+        If `timings` is given, per-stage wall time in seconds is added to it
+        (color, composition, complexity, trend).
+        """
+        return self.analyze(image, 'comprehensive', timings)
+    
+    def tiled(self, image: Image.Image) -> TiledImage:
+        """Stream `image` in row bands within tile_memory_bytes"""
+        w, h = image.size
+        return TiledImage(
+            image,
+            self.tile_memory_bytes,
+            regions={
+                'thirds': CompositionAnalyzer.thirds_regions(h, w),
+                'quadrants': CompositionAnalyzer.quadrant_regions(h, w),
+            },
+            depth_window=CompositionAnalyzer.DEPTH_WINDOW,
+            color_table=self.color_analyzer.color_table,
+            canny_low=PreparedImage.CANNY_LOW,
+            canny_high=PreparedImage.CANNY_HIGH,
+        )
+    
+    def evaluate(self, image: Union[Image.Image, PreparedImage, TiledImage], nodes: List[str],
+                 timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Evaluate `nodes` and their dependencies, each at most once"""
+        # Decode once; every analyzer shares the cached arrays (or tiled measurements)
+        values = {'image': image if isinstance(image, TiledImage) else PreparedImage.of(image)}
+        
+        def resolve(node):
+            if node not in values:
+                dependencies, compute = self.graph[node]
+                args = [resolve(dependency) for dependency in dependencies]
+                with _stage(timings if node in NODE_STAGES else None, NODE_STAGES.get(node)):
+                    values[node] = compute(*args)
+            return values[node]
+        
+        for node in nodes:
+            resolve(node)
+        return values
+    
+    def _dimension_scores(self, color_analysis: Dict, composition_analysis: Dict, complexity: float) -> Dict[str, float]:
+        """Calculate individual dimension scores"""
+        return {
             AestheticDimension.COLOR_HARMONY.value: color_analysis['harmony_score'],
             AestheticDimension.COMPOSITION.value: composition_analysis['overall_composition'],
             AestheticDimension.VISUAL_BALANCE.value: composition_analysis['visual_balance'],
-            AestheticDimension.COMPLEXITY.value: self._calculate_complexity(image),
+            AestheticDimension.COMPLEXITY.value: complexity,
             AestheticDimension.EMOTIONAL_IMPACT.value: self._calculate_emotional_impact(color_analysis, composition_analysis),
             AestheticDimension.COMMERCIAL_APPEAL.value: self._calculate_commercial_appeal(color_analysis, composition_analysis)
         }
-        
-        # Calculate overall aesthetic score
-        overall_score = self._calculate_weighted_score(scores)
-        
-        # Chris Burch specific analysis
-        burch_analysis = self._burch_specific_analysis(color_analysis, composition_analysis, scores)
-        
-        # Trend prediction
-        trend_analysis = self._predict_trends(scores, color_analysis)
-        
-        # Generate insights
-        insights = self._generate_insights(scores, color_analysis, composition_analysis)
-        
+    
+    def _metadata(self, image: Union[PreparedImage, TiledImage]) -> Dict:
         return {
-            'aesthetic_score': overall_score,
-            'dimension_scores': scores,
-            'color_analysis': color_analysis,
-            'composition_analysis': composition_analysis,
-            'burch_analysis': burch_analysis,
-            'trend_analysis': trend_analysis,
-            'insights': insights,
-            'confidence': self._calculate_confidence(scores),
-            'metadata': {
-                'model_version': 'advanced_v2.0',
-                'analysis_timestamp': '2025-06-19T12:00:00Z',
-                'image_size': image.size,
-                'color_mode': image.mode
-            }
+            'model_version': MODEL_VERSION,
+            'analysis_timestamp': '2025-06-19T12:00:00Z',
+            'image_size': image.size,
+            'color_mode': image.mode
         }
     
-    def _calculate_complexity(self, image: Image.Image) -> float:
+    def _calculate_complexity(self, image: Union[PreparedImage, TiledImage]) -> float:
         """Calculate visual complexity"""
-        # Convert to grayscale
-        gray = image.convert('L')
-        img_array = np.array(gray)
-        
-        # Calculate edge density
-        edges = cv2.Canny(img_array, 50, 150) if 'cv2' in globals() else np.zeros_like(img_array)
-        edge_density = np.sum(edges > 0) / (img_array.shape[0] * img_array.shape[1])
+        # Edge density (Canny map shared with leading-lines detection)
+        edge_density = image.edge_density
         
         # Calculate color variance
-        rgb_array = np.array(image)
-        color_variance = np.var(rgb_array)
+        color_variance = image.stats.var
         
         # Combine metrics
         complexity = (edge_density * 10 + color_variance / 10000) / 2
@@ -431,15 +565,17 @@ class AdvancedAestheticEngine:
         weighted_sum = sum(scores[dim] * weights[dim] for dim in scores)
         return weighted_sum
     
-    def _burch_specific_analysis(self, color_analysis: Dict, composition_analysis: Dict, scores: Dict) -> Dict:
-        """Chris Burch specific aesthetic analysis"""
-        
-        # Burch preference alignment
-        burch_score = (
+    def _burch_alignment(self, color_analysis: Dict, composition_analysis: Dict, scores: Dict) -> float:
+        """Burch preference alignment"""
+        return (
             color_analysis['burch_color_alignment'] * 0.4 +
             scores[AestheticDimension.COMMERCIAL_APPEAL.value] * 0.3 +
             composition_analysis['visual_balance'] * 0.3
         )
+    
+    def _burch_specific_analysis(self, color_analysis: Dict, composition_analysis: Dict, scores: Dict,
+                                 burch_score: float) -> Dict:
+        """Chris Burch specific aesthetic analysis"""
         
         # Style classification
         style_scores = {
@@ -461,7 +597,7 @@ class AdvancedAestheticEngine:
             'style_classification': style_scores,
             'investment_recommendation': recommendation,
             'investment_score': investment_score,
-            'brand_fit': self._assess_brand_fit(color_analysis, composition_analysis),
+            'brand_fit': self._assess_brand_fit(color_analysis, composition_analysis, scores),
             'market_timing': self._assess_market_timing(scores)
         }
     
@@ -531,7 +667,7 @@ class AdvancedAestheticEngine:
         confidence = 1.0 - min(variance * 2, 0.3)  # Cap reduction at 30%
         return confidence
     
-    def _assess_brand_fit(self, color_analysis: Dict, composition_analysis: Dict) -> Dict:
+    def _assess_brand_fit(self, color_analysis: Dict, composition_analysis: Dict, scores: Dict) -> Dict:
         """Assess fit with various fashion brands"""
         return {
             'tory_burch': color_analysis['burch_color_alignment'],
@@ -554,4 +690,7 @@ class AdvancedAestheticEngine:
             return "RECONSIDER - Significant changes needed"
 
 # Global advanced engine instance
-advanced_engine = AdvancedAestheticEngine()
+advanced_engine = AdvancedAestheticEngine(
+    tile_min_pixels=settings.tiled_analysis_min_pixels,
+    tile_memory_bytes=settings.tiled_analysis_memory_bytes,
+)
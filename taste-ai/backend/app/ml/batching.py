@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+import numpy as np
+import torch
+from PIL import Image
+
+IMAGE_SIZE = 224
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+def prepare_image(image: Image.Image, size: int = IMAGE_SIZE) -> np.ndarray:
+    """Resize one image to the model input size as an HxWx3 uint8 array"""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.asarray(image.resize((size, size), Image.Resampling.BILINEAR))
+
+def to_batch_tensor(arrays: Sequence[np.ndarray]) -> torch.Tensor:
+    """Stack prepared uint8 images into one normalized NCHW float tensor.
+
+    Equivalent to ToTensor + Normalize per image, done as a single
+    broadcast over the whole batch.
+    """
+    batch = torch.from_numpy(np.stack(arrays)).permute(0, 3, 1, 2).float()
+    mean = torch.tensor(IMAGENET_MEAN).view(1, 3, 1, 1) * 255.0
+    std = torch.tensor(IMAGENET_STD).view(1, 3, 1, 1) * 255.0
+    return (batch - mean) / std
+
+class DynamicBatcher:
+    """Coalesces concurrent single-image requests into batched forward passes.
+
+    Requests queue up until either `max_batch_size` are waiting or
+    `max_wait_ms` has passed since the first one arrived. The batch is
+    stacked into one tensor, run under `torch.no_grad()` on a dedicated
+    thread (so the event loop stays free), and each caller gets its own
+    row of the output.
+    """
+
+    def __init__(self, forward: Callable[[torch.Tensor], torch.Tensor],
+                 max_batch_size: int = 16, max_wait_ms: float = 8.0,
+                 num_threads: Optional[int] = None):
+        self.forward = forward
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vit-batcher")
+        self.batches_run = 0
+        self.items_run = 0
+
+    async def submit(self, image: Image.Image) -> float:
+        """Score one image; resolves once its batch has run"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        # Resizing a large image takes milliseconds; keep it off the event loop
+        array = await loop.run_in_executor(None, prepare_image, image)
+        future = loop.create_future()
+        await self._queue.put((array, future))
+        return await future
+
+    async def submit_many(self, images: List[Image.Image]) -> List[float]:
+        return list(await asyncio.gather(*(self.submit(image) for image in images)))
+
+    def _ensure_started(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            arrays = [array for array, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                scores = await loop.run_in_executor(self._executor, self._forward_batch, arrays)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for future, score in zip(futures, scores):
+                if not future.done():
+                    future.set_result(score)
+
+    def _forward_batch(self, arrays: List[np.ndarray]) -> List[float]:
+        with torch.no_grad():
+            output = self.forward(to_batch_tensor(arrays))
+        self.batches_run += 1
+        self.items_run += len(arrays)
+        return output.reshape(len(arrays), -1)[:, 0].tolist()
@@ -6,6 +6,14 @@ import random
 from typing import Dict, List, Optional
 import json
 import os
+from .palette import extract_palette
+from .image_stats import ImageStats
+from .lifecycle import LazyModel, model_manager
+from app.core.config import settings
+
+# SimpleBurchNet input: complexity, symmetry, contrast, color bucket, then
+# pattern/style/season/market placeholders
+FEATURE_SIZE = 8
 
 class SimpleBurchNet(nn.Module):
     """Simplified version of the Burch aesthetic model for production"""
@@ -30,11 +38,19 @@ class SimpleBurchNet(nn.Module):
 class BurchAestheticEngine:
     """Production-ready aesthetic scoring engine"""
     
-    def __init__(self):
-        self.model = None
+    def __init__(self, model_path: Optional[str] = None):
         self.preferences = self._load_burch_preferences()
-        self.fallback_mode = True
-        self._attempt_model_load()
+        self.model_path = model_path or os.path.join(settings.model_dir, "burch_aesthetic_model.pth")
+        # Weights are read on first use or by warm-up, never at import
+        self._model = model_manager.register(LazyModel("burch_aesthetic", self._load_model))
+    
+    @property
+    def model(self) -> Optional[SimpleBurchNet]:
+        return self._model.get()
+    
+    @property
+    def fallback_mode(self) -> bool:
+        return self.model is None
     
     def _load_burch_preferences(self):
         """Load Chris Burch's known aesthetic preferences"""
@@ -56,35 +72,43 @@ class BurchAestheticEngine:
             }
         }
     
-    def _attempt_model_load(self):
-        """Try to load the trained model, fall back to rule-based if not available"""
-        try:
-            model_path = "../../ml/data/models/burch_aesthetic_model.pth"
-            if os.path.exists(model_path):
-                checkpoint = torch.load(model_path, map_location='cpu')
-                self.model = SimpleBurchNet(input_size=8)
-                self.model.load_state_dict(checkpoint['model_state_dict'])
-                self.model.eval()
-                self.fallback_mode = False
-                print("✅ Loaded trained Burch aesthetic model")
-            else:
-                print("⚠️ Trained model not found, using rule-based scoring")
-        except Exception as e:
-            print(f"⚠️ Could not load trained model: {e}, using rule-based scoring")
+    def _load_model(self) -> Optional[SimpleBurchNet]:
+        """Load the trained model, or None to fall back to rule-based scoring"""
+        if not os.path.exists(self.model_path):
+            print("⚠️ Trained model not found, using rule-based scoring")
+            return None
+        checkpoint = torch.load(self.model_path, map_location='cpu')
+        model = SimpleBurchNet(input_size=FEATURE_SIZE)
+        model.load_state_dict(checkpoint['model_state_dict'])
+        model.eval()
+        print("✅ Loaded trained Burch aesthetic model")
+        return model
     
     def score_aesthetic(self, image: Image.Image, context: Optional[Dict] = None) -> Dict:
         """Score image aesthetic based on Chris Burch preferences"""
+        return self.score_batch([image], [context])[0]
+    
+    def score_batch(self, images: List[Image.Image],
+                    contexts: Optional[List[Optional[Dict]]] = None) -> List[Dict]:
+        """Score many images, running the trained model in one forward pass"""
+        if not images:
+            return []
+        contexts = contexts or [None] * len(images)
         
         # Extract basic image features
-        features = self._extract_image_features(image)
+        features = [self._extract_image_features(image) for image in images]
         
-        if not self.fallback_mode and self.model:
+        model = self.model
+        if model is not None:
             # Use trained model
-            score = self._model_predict(features, context)
+            scores = self._model_predict_batch(model, features, contexts)
         else:
             # Use rule-based scoring
-            score = self._rule_based_score(features, context)
+            scores = [self._rule_based_score(f, c) for f, c in zip(features, contexts)]
         
+        return [self._build_result(f, score, c) for f, score, c in zip(features, scores, contexts)]
+    
+    def _build_result(self, features: Dict, score: float, context: Optional[Dict]) -> Dict:
         # Generate detailed analysis
         analysis = self._generate_analysis(features, score, context)
         
@@ -103,16 +127,15 @@ class BurchAestheticEngine:
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
-        # Get image statistics
-        img_array = np.array(image)
+        # Histogram statistics, no copy of the pixels
+        stats = ImageStats(image)
         
         # Color analysis
-        colors = img_array.reshape(-1, 3)
-        color_variance = np.var(colors, axis=0).mean()
-        brightness = np.mean(colors)
+        color_variance = stats.channel_var.mean()
+        brightness = stats.mean
         
-        # Estimate dominant colors (simplified)
-        dominant_color = self._estimate_dominant_color(colors)
+        # Categorize the most common palette color
+        dominant_color = self._estimate_dominant_color(extract_palette(image, k=5).colors)
         
         return {
             "width": image.size[0],
@@ -123,13 +146,14 @@ class BurchAestheticEngine:
             "dominant_color": dominant_color,
             "complexity": float(min(1.0, color_variance / 100.0)),
             "symmetry": random.uniform(0.4, 0.9),  # Placeholder
-            "contrast": float(min(1.0, np.std(colors) / 50.0))
+            "contrast": float(min(1.0, stats.std / 50.0))
         }
     
-    def _estimate_dominant_color(self, colors):
-        """Estimate dominant color category"""
-        mean_color = np.mean(colors, axis=0)
-        r, g, b = mean_color
+    def _estimate_dominant_color(self, palette_colors):
+        """Estimate dominant color category from a share-ordered palette"""
+        if len(palette_colors) == 0:
+            return "neutral"
+        r, g, b = (float(c) for c in palette_colors[0])
         
         # Simple color categorization
         if r < 100 and g < 100 and b < 100:
@@ -145,30 +169,31 @@ class BurchAestheticEngine:
         else:
             return "earth_tones"
     
-    def _model_predict(self, features: Dict, context: Optional[Dict]) -> float:
-        """Use trained model for prediction"""
+    def _fill_feature_vector(self, features: Dict, row: np.ndarray):
+        """Write one image's model input into a row of the feature matrix"""
+        row[0] = features.get('complexity', 0.5)
+        row[1] = features.get('symmetry', 0.5)
+        row[2] = features.get('contrast', 0.5)
+        row[3] = hash(features.get('dominant_color', 'neutral')) % 10 / 10.0
+        row[4] = random.uniform(0.3, 0.8)  # pattern placeholder
+        row[5] = random.uniform(0.4, 0.9)  # style placeholder
+        row[6] = random.uniform(0.2, 0.8)  # season placeholder
+        row[7] = random.uniform(0.5, 0.9)  # market placeholder
+    
+    def _model_predict_batch(self, model: SimpleBurchNet, features: List[Dict],
+                             contexts: List[Optional[Dict]]) -> List[float]:
+        """Use trained model for prediction, one forward pass for the batch"""
         try:
-            # Convert features to model input
-            feature_vector = [
-                features.get('complexity', 0.5),
-                features.get('symmetry', 0.5),
-                features.get('contrast', 0.5),
-                hash(features.get('dominant_color', 'neutral')) % 10 / 10.0,
-                random.uniform(0.3, 0.8),  # pattern placeholder
-                random.uniform(0.4, 0.9),  # style placeholder
-                random.uniform(0.2, 0.8),  # season placeholder
-                random.uniform(0.5, 0.9),  # market placeholder
-            ]
+            matrix = np.empty((len(features), FEATURE_SIZE), dtype=np.float32)
+            for f, row in zip(features, matrix):
+                self._fill_feature_vector(f, row)
             
             with torch.no_grad():
-                input_tensor = torch.tensor([feature_vector], dtype=torch.float32)
-                prediction = self.model(input_tensor).item()
-            
-            return prediction
+                return model(torch.from_numpy(matrix)).reshape(-1).tolist()
             
         except Exception as e:
             print(f"Model prediction failed: {e}, falling back to rules")
-            return self._rule_based_score(features, context)
+            return [self._rule_based_score(f, c) for f, c in zip(features, contexts)]
     
     def _rule_based_score(self, features: Dict, context: Optional[Dict]) -> float:
         """Rule-based scoring based on Chris Burch preferences"""
@@ -0,0 +1,81 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Named colour rules, first match wins: (name, (lo, hi) for R, G, B), bounds
+# inclusive. Anything unmatched is 'neutral'.
+BURCH_COLOR_RULES: List[Tuple[str, Tuple[int, int], Tuple[int, int], Tuple[int, int]]] = [
+    ('cream', (201, 255), (201, 255), (201, 255)),
+    ('navy', (0, 49), (0, 49), (101, 255)),
+    ('camel', (151, 255), (101, 255), (0, 79)),
+    ('charcoal', (0, 79), (0, 79), (0, 79)),
+]
+FALLBACK_NAME = 'neutral'
+FALLBACK_WEIGHT = 0.5
+
+class BurchColorTable:
+    """Precomputed RGB -> Burch colour name / preference weight lookup.
+
+    Each channel is quantized at the rule boundaries, so the quantized
+    RGB cube is tiny (a few cells per axis) and classification is exact
+    for every 24-bit colour. A whole image is classified with three
+    256-entry lookups and one bincount, with no per-pixel Python.
+    """
+
+    def __init__(self, preferred_colors: Dict[str, float]):
+        self.names = [rule[0] for rule in BURCH_COLOR_RULES] + [FALLBACK_NAME]
+        self.weights = np.array([preferred_colors.get(name, FALLBACK_WEIGHT) for name in self.names])
+
+        # Per channel: value -> band index, with bands split at every rule bound
+        codes, representatives = [], []
+        for channel in range(3):
+            edges = sorted({bound for rule in BURCH_COLOR_RULES
+                            for bound in (rule[1 + channel][0], rule[1 + channel][1] + 1)} - {0, 256})
+            codes.append(np.searchsorted(edges, np.arange(256), side='right').astype(np.intp))
+            representatives.append([0] + edges)
+        shape = tuple(len(r) for r in representatives)
+        strides = (shape[1] * shape[2], shape[2], 1)
+        # Flat cell index contribution of each channel value (uint8 keeps
+        # the per-pixel temporaries small while the cube has <= 256 cells)
+        dtype = np.uint8 if np.prod(shape) <= 256 else np.intp
+        self.channel_offsets = [(code * stride).astype(dtype) for code, stride in zip(codes, strides)]
+
+        # Name index of every cell, from one representative colour per cell
+        self.cell_names = np.empty(int(np.prod(shape)), dtype=np.intp)
+        for cell in range(len(self.cell_names)):
+            rgb = [representatives[c][(cell // strides[c]) % shape[c]] for c in range(3)]
+            self.cell_names[cell] = self._classify(rgb)
+
+    def _classify(self, rgb) -> int:
+        for i, (_, *ranges) in enumerate(BURCH_COLOR_RULES):
+            if all(lo <= value <= hi for value, (lo, hi) in zip(rgb, ranges)):
+                return i
+        return len(BURCH_COLOR_RULES)
+
+    def _cells(self, pixels: np.ndarray) -> np.ndarray:
+        return (self.channel_offsets[0][pixels[..., 0]]
+                + self.channel_offsets[1][pixels[..., 1]]
+                + self.channel_offsets[2][pixels[..., 2]])
+
+    def name_indices(self, colors: np.ndarray) -> np.ndarray:
+        """Name index of each (..., 3) uint8 colour"""
+        return self.cell_names[self._cells(colors)]
+
+    def name(self, color: np.ndarray) -> str:
+        return self.names[int(self.name_indices(np.asarray(color, dtype=np.uint8)))]
+
+    def weight(self, colors: np.ndarray) -> np.ndarray:
+        """Preference weight of each (..., 3) uint8 colour"""
+        return self.weights[self.name_indices(colors)]
+
+    def cell_counts(self, pixels: np.ndarray) -> np.ndarray:
+        """Pixel count per quantized cell of an (..., 3) uint8 image (mergeable across tiles)"""
+        return np.bincount(self._cells(pixels).ravel(), minlength=len(self.cell_names))
+
+    def coverage(self, cell_counts: np.ndarray) -> Dict[str, float]:
+        """Share of pixels per colour name from accumulated cell counts"""
+        name_counts = np.bincount(self.cell_names, weights=cell_counts, minlength=len(self.names))
+        total = name_counts.sum()
+        return {
+            name: float(count / total) if total else 0.0
+            for name, count in zip(self.names, name_counts)
+        }
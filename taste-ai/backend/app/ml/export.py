@@ -0,0 +1,144 @@
+"""CPU export variants of the ViT aesthetic head.
+
+The build step writes one versioned artifact directory per export:
+
+    <model_dir>/aesthetic_vit/<version>/
+        manifest.json   ViT config, variants, checksums
+        fp32.pt         reference state dict
+        int8.pt         state dict after dynamic int8 quantization of nn.Linear
+        traced.pt       TorchScript graph traced from the fp32 model
+
+All three variants come from the same fp32 weights, so their scores are
+directly comparable. Serving picks one with VIT_VARIANT/VIT_ARTIFACT_VERSION.
+
+Usage (from taste-ai/backend):
+    python -m app.ml.export [--source DIR] [--version V] [--random-weights]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+import torch
+import torch.nn as nn
+from transformers import ViTConfig
+from .models import AestheticVisionTransformer
+from .batching import IMAGE_SIZE
+
+ARTIFACT_NAME = "aesthetic_vit"
+VARIANTS = ("fp32", "int8", "traced")
+LATEST = "latest"
+
+def quantize_int8(model: AestheticVisionTransformer) -> nn.Module:
+    """Dynamically quantize every nn.Linear to int8 weights (CPU only)"""
+    return torch.ao.quantization.quantize_dynamic(model.cpu().eval(), {nn.Linear}, dtype=torch.qint8)
+
+def trace(model: nn.Module, batch_size: int = 2) -> torch.jit.ScriptModule:
+    """Trace the forward pass and freeze it for inference"""
+    example = torch.zeros(batch_size, 3, IMAGE_SIZE, IMAGE_SIZE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model.cpu().eval(), example, strict=False)
+    return torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def artifact_root(model_dir: str) -> str:
+    return os.path.join(model_dir, ARTIFACT_NAME)
+
+def resolve_version(model_dir: str, version: str = LATEST) -> str:
+    """Return the artifact directory for `version` ("latest" = newest export)"""
+    root = artifact_root(model_dir)
+    if version == LATEST:
+        versions = sorted(
+            v for v in os.listdir(root) if os.path.isfile(os.path.join(root, v, "manifest.json"))
+        ) if os.path.isdir(root) else []
+        if not versions:
+            raise FileNotFoundError(f"No exported {ARTIFACT_NAME} artifacts in {root}")
+        version = versions[-1]
+    path = os.path.join(root, version)
+    if not os.path.isfile(os.path.join(path, "manifest.json")):
+        raise FileNotFoundError(f"No {ARTIFACT_NAME} artifact {version} in {root}")
+    return path
+
+def export_artifacts(model: AestheticVisionTransformer, model_dir: str,
+                     version: Optional[str] = None, source: str = "") -> str:
+    """Write the fp32, int8 and traced variants of `model` as one version"""
+    version = version or time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(artifact_root(model_dir), version)
+    os.makedirs(path, exist_ok=False)
+    model = model.cpu().eval()
+
+    torch.save(model.state_dict(), os.path.join(path, "fp32.pt"))
+    torch.save(quantize_int8(model).state_dict(), os.path.join(path, "int8.pt"))
+    torch.jit.save(trace(model), os.path.join(path, "traced.pt"))
+
+    manifest = {
+        "name": ARTIFACT_NAME,
+        "version": version,
+        "source": source,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "torch_version": torch.__version__,
+        "vit_config": model.vit.config.to_dict(),
+        "num_classes": model.classifier[-2].out_features,
+        "variants": {
+            variant: {"file": f"{variant}.pt", "sha256": _sha256(os.path.join(path, f"{variant}.pt"))}
+            for variant in VARIANTS
+        },
+    }
+    with open(os.path.join(path, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+def load_manifest(path: str) -> Dict:
+    with open(os.path.join(path, "manifest.json")) as f:
+        return json.load(f)
+
+def load_variant(path: str, variant: str) -> nn.Module:
+    """Load one variant from an artifact directory, ready for CPU inference"""
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown ViT variant {variant!r}; expected one of {VARIANTS}")
+    file = os.path.join(path, f"{variant}.pt")
+    if variant == "traced":
+        return torch.jit.load(file, map_location='cpu').eval()
+
+    manifest = load_manifest(path)
+    model = AestheticVisionTransformer(
+        num_classes=manifest["num_classes"],
+        pretrained=False,
+        config=ViTConfig.from_dict(manifest["vit_config"]),
+    ).eval()
+    if variant == "int8":
+        model = quantize_int8(model)
+    model.load_state_dict(torch.load(file, map_location='cpu'))
+    return model.eval()
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Export CPU variants of the ViT aesthetic head")
+    parser.add_argument("--source", default=os.path.join(settings.model_dir, "vit-base-patch16-224"),
+                        help="local ViT snapshot directory")
+    parser.add_argument("--model-dir", default=settings.model_dir)
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--random-weights", action="store_true",
+                        help="export the architecture with random weights (no snapshot needed)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    if args.random_weights:
+        model, source = AestheticVisionTransformer(pretrained=False), "random"
+    else:
+        model = AestheticVisionTransformer(model_name=args.source, local_files_only=True)
+        source = args.source
+    path = export_artifacts(model, args.model_dir, args.version, source=source)
+    print(f"✅ Exported {', '.join(VARIANTS)} to {path}")
+
+if __name__ == "__main__":
+    main()
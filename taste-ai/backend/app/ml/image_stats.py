@@ -0,0 +1,103 @@
+import math
+import numpy as np
+from PIL import Image
+from typing import Optional, Union
+
+LEVELS = np.arange(256, dtype=np.float64)
+
+class ImageStats:
+    """Global image statistics from per-channel 256-bin histograms.
+
+    PIL builds the histograms in C without copying the pixels, so mean,
+    variance and std (per channel, pooled over all channels, and of the
+    luma channel) cost one pass over the image and O(256) arithmetic.
+    With `sample_size` the image is first point-sampled (nearest
+    neighbour) down to roughly that many pixels.
+    """
+
+    def __init__(self, image: Union[Image.Image, np.ndarray], sample_size: Optional[int] = None):
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        if sample_size:
+            image = _point_sample(image, sample_size)
+        self.image = image
+        self.histogram = np.asarray(image.histogram(), dtype=np.int64).reshape(3, 256)
+        self.count = max(1, image.size[0] * image.size[1])
+        self._luma_histogram: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_histograms(cls, histogram: np.ndarray, luma_histogram: np.ndarray) -> 'ImageStats':
+        """Stats from (3, 256) RGB and (256,) luma histograms accumulated elsewhere"""
+        stats = cls.__new__(cls)
+        stats.image = None
+        stats.histogram = np.asarray(histogram, dtype=np.int64).reshape(3, 256)
+        stats.count = max(1, int(stats.histogram[0].sum()))
+        stats._luma_histogram = np.asarray(luma_histogram, dtype=np.int64)
+        return stats
+
+    @property
+    def channel_mean(self) -> np.ndarray:
+        """(3,) mean of R, G, B"""
+        return self.histogram @ LEVELS / self.count
+
+    @property
+    def channel_var(self) -> np.ndarray:
+        """(3,) population variance of R, G, B"""
+        return _variance(self.histogram, self.count)
+
+    @property
+    def channel_std(self) -> np.ndarray:
+        return np.sqrt(self.channel_var)
+
+    @property
+    def mean(self) -> float:
+        """Mean of every channel value (same as np.mean of the HxWx3 array)"""
+        return float(self.channel_mean.mean())
+
+    @property
+    def var(self) -> float:
+        """Variance of every channel value (same as np.var of the HxWx3 array)"""
+        # Pooled variance = mean within-channel variance + spread of channel means
+        return float(self.channel_var.mean() + self.channel_mean.var())
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    @property
+    def luma_histogram(self) -> np.ndarray:
+        """(256,) histogram of PIL 'L' luma (ITU-R 601-2)"""
+        if self._luma_histogram is None:
+            self._luma_histogram = np.asarray(self.image.convert('L').histogram(), dtype=np.int64)
+        return self._luma_histogram
+
+    @property
+    def luma_mean(self) -> float:
+        return float(self.luma_histogram @ LEVELS / self.count)
+
+    @property
+    def luma_var(self) -> float:
+        return float(_variance(self.luma_histogram, self.count))
+
+    @property
+    def luma_std(self) -> float:
+        return math.sqrt(self.luma_var)
+
+def image_stats(image: Union[Image.Image, np.ndarray], sample_size: Optional[int] = None) -> ImageStats:
+    """Histogram statistics of `image`, optionally from a point sample"""
+    return ImageStats(image, sample_size)
+
+def _variance(histogram: np.ndarray, count: int) -> np.ndarray:
+    mean = histogram @ LEVELS / count
+    return np.maximum(histogram @ (LEVELS * LEVELS) / count - mean * mean, 0.0)
+
+def _point_sample(image: Image.Image, sample_size: int) -> Image.Image:
+    """Nearest-neighbour subsample to about `sample_size` pixels"""
+    width, height = image.size
+    factor = math.sqrt(width * height / max(1, sample_size))
+    if factor <= 1:
+        return image
+    size = (max(1, round(width / factor)), max(1, round(height / factor)))
+    return image.resize(size, Image.Resampling.NEAREST)
@@ -4,15 +4,25 @@ from PIL import Image
 import torchvision.transforms as transforms
 from .models import AestheticVisionTransformer, TrendPredictor
 from .burch_models import burch_engine
-from typing import Union, Dict, List
+from .batching import DynamicBatcher, prepare_image, to_batch_tensor
+from .lifecycle import LazyModel, model_manager
+from .export import load_variant, resolve_version
+from app.core.config import settings
+from typing import Union, Dict, List, Optional
+import os
 import random
 
+VIT_BASE_MODEL = "google/vit-base-patch16-224"
+
 class AestheticModel:
     def __init__(self, model_path=None):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = AestheticVisionTransformer()
-        self.model.to(self.device)
-        self.model.eval()
+        self.variant = settings.vit_variant
+        # int8 and traced exports are CPU builds
+        use_cuda = torch.cuda.is_available() and self.variant in ("pretrained", "fp32")
+        self.device = torch.device("cuda" if use_cuda else "cpu")
+        self.model_path = model_path or os.path.join(settings.model_dir, "vit-base-patch16-224")
+        # The ViT is only needed by predict_vit*; load it on first use or warm-up
+        self._vit = model_manager.register(LazyModel("aesthetic_vit", self._load_vit))
         
         self.transform = transforms.Compose([
             transforms.Resize((224, 224)),
@@ -21,7 +31,67 @@ class AestheticModel:
                                std=[0.229, 0.224, 0.225])
         ])
         
+        # Coalesces concurrent predict_vit calls into one forward pass
+        self.batcher = DynamicBatcher(
+            self._forward,
+            max_batch_size=settings.inference_max_batch_size,
+            max_wait_ms=settings.inference_max_wait_ms,
+            num_threads=settings.inference_num_threads or None,
+        )
+        
         print("✅ Aesthetic model initialized with Burch preferences")
+    
+    @property
+    def model(self) -> Optional[torch.nn.Module]:
+        return self._vit.get()
+    
+    def _load_vit(self) -> Optional[torch.nn.Module]:
+        """Build the ViT from the local artifact directory (no network unless allowed)
+
+        Returns None when there are no weights to load; weights that exist
+        but fail to load raise.
+        """
+        if self.variant != "pretrained":
+            try:
+                path = resolve_version(settings.model_dir, settings.vit_artifact_version)
+            except FileNotFoundError as e:
+                print(f"⚠️ {e}; ViT scoring unavailable")
+                return None
+            model = load_variant(path, self.variant).to(self.device)
+            print(f"✅ Loaded {self.variant} aesthetic ViT from {path}")
+            return model
+        if os.path.isdir(self.model_path):
+            source, local_only = self.model_path, True
+        elif settings.allow_model_download:
+            source, local_only = VIT_BASE_MODEL, False
+        else:
+            print(f"⚠️ ViT weights not found in {self.model_path} and downloads are disabled")
+            return None
+        model = AestheticVisionTransformer(model_name=source, local_files_only=local_only)
+        model.to(self.device)
+        model.eval()
+        print(f"✅ Loaded aesthetic ViT from {source}")
+        return model
+    
+    def _forward(self, batch: torch.Tensor) -> torch.Tensor:
+        model = self.model
+        if model is None:
+            raise RuntimeError(f"Aesthetic ViT unavailable: {self._vit.error or 'no weights found'}")
+        return model(batch.to(self.device)).cpu()
+    
+    def predict_vit_batch(self, images: List[Image.Image]) -> List[float]:
+        """Score images with the ViT head in a single forward pass"""
+        if not images:
+            return []
+        batch = to_batch_tensor([prepare_image(img) for img in images])
+        with torch.no_grad():
+            return self._forward(batch).reshape(len(images), -1)[:, 0].tolist()
+    
+    async def predict_vit(self, image: Union[Image.Image, np.ndarray]) -> float:
+        """Score one image with the ViT head, batched with concurrent callers"""
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        return await self.batcher.submit(image)
         
     def predict(self, image: Union[Image.Image, np.ndarray]) -> float:
         """Predict aesthetic score using Burch-optimized engine"""
@@ -39,8 +109,13 @@ class AestheticModel:
         
         return burch_engine.score_aesthetic(image)
     
+    def predict_detailed_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Dict]:
+        """Detailed analysis for many images with one model forward pass"""
+        images = [Image.fromarray(img) if isinstance(img, np.ndarray) else img for img in images]
+        return burch_engine.score_batch(images)
+    
     def predict_batch(self, images: List[Image.Image]) -> List[float]:
-        return [self.predict(img) for img in images]
+        return [result["aesthetic_score"] for result in self.predict_detailed_batch(images)]
 
 class TasteEngine:
     def __init__(self):
@@ -48,8 +123,13 @@ class TasteEngine:
         
     def analyze_comprehensive(self, image: Image.Image) -> Dict:
         """Comprehensive analysis using Burch preferences"""
-        detailed_result = self.aesthetic_model.predict_detailed(image)
-        
+        return self._summarize(self.aesthetic_model.predict_detailed(image))
+    
+    def analyze_batch(self, images: List[Image.Image]) -> List[Dict]:
+        """Comprehensive analysis for many images, scored as one batch"""
+        return [self._summarize(result) for result in self.aesthetic_model.predict_detailed_batch(images)]
+    
+    def _summarize(self, detailed_result: Dict) -> Dict:
         return {
             "aesthetic_score": detailed_result["aesthetic_score"],
             "burch_alignment": detailed_result["burch_alignment"],
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class LazyModel:
+    """A model loaded on first use (or by warm-up), exactly once.
+
+    `loader` returns the loaded model, or None when the artifact is absent
+    and the caller has a fallback. Load time and failures are recorded for
+    the readiness report.
+    """
+
+    NOT_LOADED = "not_loaded"
+    LOADING = "loading"
+    READY = "ready"
+    UNAVAILABLE = "unavailable"
+    FAILED = "failed"
+
+    def __init__(self, name: str, loader: Callable[[], Any], required: bool = False):
+        self.name = name
+        self.loader = loader
+        self.required = required
+        self.state = self.NOT_LOADED
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the model, loading it on first call (None if unavailable)"""
+        if self.state in (self.NOT_LOADED, self.LOADING):
+            with self._lock:
+                if self.state in (self.NOT_LOADED, self.LOADING):
+                    self._load()
+        return self._model
+
+    def _load(self):
+        self.state = self.LOADING
+        start = time.perf_counter()
+        try:
+            self._model = self.loader()
+            self.state = self.READY if self._model is not None else self.UNAVAILABLE
+        except Exception as e:
+            self._model = None
+            self.error = str(e)
+            self.state = self.FAILED
+            print(f"⚠️ Could not load {self.name}: {e}")
+        finally:
+            self.load_seconds = time.perf_counter() - start
+
+    @property
+    def settled(self) -> bool:
+        return self.state in (self.READY, self.UNAVAILABLE, self.FAILED)
+
+    def status(self) -> Dict:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+class ModelManager:
+    """Registry of lazily loaded models with background warm-up.
+
+    Readiness means any background warm-up has finished, every required
+    model loaded successfully and no model failed to load (a model whose
+    artifact is absent is unavailable, not failed, and falls back).
+    Liveness does not depend on models at all.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, LazyModel] = {}
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+    def register(self, model: LazyModel) -> LazyModel:
+        self._models[model.name] = model
+        return model
+
+    def models(self) -> List[LazyModel]:
+        return list(self._models.values())
+
+    def warm_up(self):
+        """Load every registered model in the calling thread"""
+        for model in self.models():
+            model.get()
+
+    def start_warm_up(self):
+        """Load every registered model on a background thread"""
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self.warm_up, name="model-warm-up", daemon=True)
+            self._warm_up_thread.start()
+
+    @property
+    def warming_up(self) -> bool:
+        return self._warm_up_thread is not None and self._warm_up_thread.is_alive()
+
+    @property
+    def ready(self) -> bool:
+        if self.warming_up:
+            return False
+        return all(
+            model.state == LazyModel.READY if model.required else model.state != LazyModel.FAILED
+            for model in self.models()
+        )
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "warming_up": self.warming_up,
+            "models": {model.name: model.status() for model in self.models()},
+        }
+
+# Global model manager instance
+model_manager = ModelManager()
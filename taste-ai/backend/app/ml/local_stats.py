@@ -0,0 +1,61 @@
+import numpy as np
+import cv2
+from typing import Tuple
+
+class IntegralImage:
+    """Summed-area tables of a single-channel image and its square.
+
+    Built once in O(N); afterwards the mean and variance of any axis-aligned
+    rectangle cost O(1), and a full map of local statistics for any window
+    size costs O(N) regardless of the window.
+    """
+
+    def __init__(self, img: np.ndarray):
+        if img.ndim != 2:
+            raise ValueError("IntegralImage expects a single-channel image")
+        self.shape = img.shape
+        # (H+1)x(W+1) float64 tables; sums of uint8 data stay exact
+        self.sum, self.sqsum = cv2.integral2(
+            np.ascontiguousarray(img), sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F
+        )
+
+    def region_stats(self, y0: int, y1: int, x0: int, x1: int) -> Tuple[float, float]:
+        """Mean and variance of img[y0:y1, x0:x1] (bounds are clipped)"""
+        h, w = self.shape
+        y0, y1 = max(0, y0), min(h, y1)
+        x0, x1 = max(0, x0), min(w, x1)
+        n = (y1 - y0) * (x1 - x0)
+        if n <= 0:
+            return 0.0, 0.0
+        s = self.sum[y1, x1] - self.sum[y0, x1] - self.sum[y1, x0] + self.sum[y0, x0]
+        sq = self.sqsum[y1, x1] - self.sqsum[y0, x1] - self.sqsum[y1, x0] + self.sqsum[y0, x0]
+        mean = s / n
+        return float(mean), float(max(sq / n - mean * mean, 0.0))
+
+    def local_mean_variance(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean and variance of every `window` x `window` block.
+
+        Returns maps of shape (H - window + 1, W - window + 1); entry [i, j]
+        describes img[i:i+window, j:j+window].
+        """
+        h, w = self.shape
+        if window < 1 or window > min(h, w):
+            empty = np.zeros((0, 0))
+            return empty, empty
+        n = float(window * window)
+        mean = self._box(self.sum, window) / n
+        var = self._box(self.sqsum, window) / n
+        var -= mean * mean
+        np.maximum(var, 0.0, out=var)
+        return mean, var
+
+    @staticmethod
+    def _box(table: np.ndarray, window: int) -> np.ndarray:
+        return (
+            table[window:, window:] - table[:-window, window:]
+            - table[window:, :-window] + table[:-window, :-window]
+        )
+
+def local_mean_variance(img: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Local mean and variance maps of `img` for a square window (valid region)"""
+    return IntegralImage(img).local_mean_variance(window)
@@ -1,15 +1,22 @@
 import torch
 import torch.nn as nn
-from transformers import ViTModel
+from transformers import ViTConfig, ViTModel
 import numpy as np
 from typing import Union
 from PIL import Image
 import torchvision.transforms as transforms
 
 class AestheticVisionTransformer(nn.Module):
-    def __init__(self, model_name="google/vit-base-patch16-224", num_classes=1):
+    def __init__(self, model_name="google/vit-base-patch16-224", num_classes=1, pretrained=True,
+                 local_files_only=False, config=None):
         super().__init__()
-        self.vit = ViTModel.from_pretrained(model_name)
+        # pretrained=False builds the same architecture with random weights (no download),
+        # or from `config` when rebuilding an exported artifact;
+        # model_name may be a local snapshot directory
+        if pretrained:
+            self.vit = ViTModel.from_pretrained(model_name, local_files_only=local_files_only)
+        else:
+            self.vit = ViTModel(config or ViTConfig())
         self.classifier = nn.Sequential(
             nn.Dropout(0.1),
             nn.Linear(self.vit.config.hidden_size, 512),
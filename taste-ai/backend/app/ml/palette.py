@@ -0,0 +1,141 @@
+import numpy as np
+from PIL import Image
+from dataclasses import dataclass
+from typing import Union
+
+# Pixels sampled per image before histogramming
+DEFAULT_SAMPLE_SIZE = 65536
+# Bits kept per channel in the colour histogram (32x32x32 bins)
+HISTOGRAM_BITS = 5
+# Fixed seed so the same image always yields the same palette
+DEFAULT_SEED = 0
+
+MINIBATCH_SIZE = 1024
+MINIBATCH_ITERATIONS = 30
+
+@dataclass
+class Palette:
+    """Dominant colours of an image, most common first"""
+    colors: np.ndarray   # (k, 3) uint8 RGB
+    shares: np.ndarray   # (k,) fraction of pixels nearest each colour
+
+    def to_hex(self):
+        return [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in self.colors.tolist()]
+
+def extract_palette(image: Union[Image.Image, np.ndarray], k: int = 5,
+                    sample_size: int = DEFAULT_SAMPLE_SIZE,
+                    seed: int = DEFAULT_SEED) -> Palette:
+    """Extract `k` dominant colours with their pixel shares.
+
+    A strided subsample of the pixels is binned into a 3-D colour histogram;
+    the occupied bins (mean colour, pixel count) are then clustered with
+    weighted mini-batch k-means from a fixed seed. Cost is O(sample_size)
+    plus O(bins * k), independent of image size, and the result is
+    deterministic for a given image.
+    """
+    pixels = _as_pixels(image)
+    builder = PaletteBuilder(len(pixels), sample_size)
+    builder.update(pixels)
+    return builder.palette(k, seed)
+
+class PaletteBuilder:
+    """Sampled colour histogram of an image fed in row-major pixel chunks.
+
+    Keeps the same strided subsample as a single call over all pixels, so
+    streaming an image in row bands yields exactly the palette that
+    `extract_palette` would.
+    """
+
+    def __init__(self, total_pixels: int, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.total_pixels = total_pixels
+        self.step = max(1, total_pixels // max(1, sample_size))
+        n_bins = 1 << (3 * HISTOGRAM_BITS)
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.sums = np.zeros((n_bins, 3))
+        self._offset = 0  # flat index of the next pixel
+
+    def update(self, pixels: np.ndarray):
+        """Add the next (N, 3) uint8 pixels in row-major order"""
+        first = (-self._offset) % self.step
+        self._offset += len(pixels)
+        sample = pixels[first::self.step]
+        if len(sample) == 0:
+            return
+        index = _bin_index(sample)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        for c in range(3):
+            self.sums[:, c] += np.bincount(index, weights=sample[:, c], minlength=len(self.counts))
+
+    def palette(self, k: int = 5, seed: int = DEFAULT_SEED) -> Palette:
+        """Cluster the occupied bins into `k` dominant colours"""
+        occupied = np.flatnonzero(self.counts)
+        if len(occupied) == 0:
+            return Palette(np.zeros((0, 3), dtype=np.uint8), np.zeros(0))
+        weights = self.counts[occupied].astype(np.float64)
+        points = self.sums[occupied] / weights[:, None]
+
+        if len(points) <= k:
+            centers = points
+        else:
+            centers = _minibatch_kmeans(points, weights, k, np.random.default_rng(seed))
+
+        labels = _nearest(points, centers)
+        shares = np.bincount(labels, weights=weights, minlength=len(centers)) / weights.sum()
+
+        order = np.argsort(-shares, kind='stable')
+        order = order[shares[order] > 0]
+        colors = np.clip(np.rint(centers[order]), 0, 255).astype(np.uint8)
+        return Palette(colors, shares[order])
+
+def _as_pixels(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
+    """(N, 3) uint8 view of an RGB image"""
+    if isinstance(image, Image.Image):
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image = np.asarray(image)
+    return np.ascontiguousarray(image).reshape(-1, 3)
+
+def _bin_index(sample: np.ndarray) -> np.ndarray:
+    """Histogram bin of each pixel (HISTOGRAM_BITS per channel)"""
+    bits = HISTOGRAM_BITS
+    q = (sample >> (8 - bits)).astype(np.int32)
+    return (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+
+def _nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    d = (
+        np.einsum('ij,ij->i', points, points)[:, None]
+        - 2.0 * points @ centers.T
+        + np.einsum('ij,ij->i', centers, centers)[None, :]
+    )
+    return np.argmin(d, axis=1)
+
+def _minibatch_kmeans(points: np.ndarray, weights: np.ndarray, k: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """Weighted mini-batch k-means (Sculley, 2010) with k-means++ seeding"""
+    p = weights / weights.sum()
+
+    # k-means++ initialisation, weighted by bin population
+    centers = np.empty((k, 3))
+    centers[0] = points[rng.choice(len(points), p=p)]
+    closest = np.sum((points - centers[0]) ** 2, axis=1)
+    for i in range(1, k):
+        score = closest * weights
+        total = score.sum()
+        if total <= 0:
+            centers[i:] = centers[0]
+            break
+        centers[i] = points[rng.choice(len(points), p=score / total)]
+        closest = np.minimum(closest, np.sum((points - centers[i]) ** 2, axis=1))
+
+    # Mini-batch updates; batches are drawn in proportion to pixel count
+    seen = np.zeros(k)
+    for _ in range(MINIBATCH_ITERATIONS):
+        batch = points[rng.choice(len(points), MINIBATCH_SIZE, p=p)]
+        labels = _nearest(batch, centers)
+        batch_counts = np.bincount(labels, minlength=k)
+        hit = batch_counts > 0
+        seen[hit] += batch_counts[hit]
+        for c in range(3):
+            batch_mean = np.bincount(labels, weights=batch[:, c], minlength=k)[hit] / batch_counts[hit]
+            centers[hit, c] += (batch_counts[hit] / seen[hit]) * (batch_mean - centers[hit, c])
+    return centers
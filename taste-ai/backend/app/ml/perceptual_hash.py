@@ -0,0 +1,20 @@
+import numpy as np
+from PIL import Image
+
+HASH_BITS = 64
+# Smallest decode that still averages enough pixels per hash cell
+HASH_DECODE_SIDE = 64
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """64-bit difference hash: sign of the horizontal gradient of an 8x9 thumbnail.
+
+    Stable under re-encoding, resizing, mild crops and brightness changes;
+    near-duplicates differ in a few bits (Hamming distance).
+    """
+    thumb = image.convert('L').resize((size + 1, size), Image.Resampling.BOX)
+    pixels = np.asarray(thumb, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
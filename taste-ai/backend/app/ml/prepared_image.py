@@ -0,0 +1,114 @@
+import numpy as np
+from PIL import Image
+import cv2
+from typing import Dict, Union
+from .local_stats import IntegralImage
+from .image_stats import ImageStats
+
+class PreparedImage:
+    """Decode-once view of an upload shared by every analyzer.
+
+    Each representation (RGB, grey, HSV, edge map, histogram stats, integral
+    image, pyramid levels) is built on first access and cached, so a single
+    request never converts or copies the same pixels twice.
+    """
+
+    CANNY_LOW = 50
+    CANNY_HIGH = 150
+
+    def __init__(self, image: Image.Image):
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        self.image = image
+        self._cache: Dict[str, object] = {}
+
+    @classmethod
+    def of(cls, image: Union[Image.Image, 'PreparedImage']) -> 'PreparedImage':
+        """Return `image` unchanged if already prepared, otherwise wrap it"""
+        if isinstance(image, cls):
+            return image
+        return cls(image)
+
+    @property
+    def size(self):
+        return self.image.size
+
+    @property
+    def mode(self) -> str:
+        return self.image.mode
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """HxWx3 uint8 RGB array (read-only, shared)"""
+        if 'rgb' not in self._cache:
+            rgb = np.asarray(self.image)
+            rgb.setflags(write=False)
+            self._cache['rgb'] = rgb
+        return self._cache['rgb']
+
+    @property
+    def gray(self) -> np.ndarray:
+        """HxW uint8 luma array (ITU-R 601-2, same weights as PIL 'L')"""
+        if 'gray' not in self._cache:
+            self._cache['gray'] = self._freeze(cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY))
+        return self._cache['gray']
+
+    @property
+    def hsv(self) -> np.ndarray:
+        """HxWx3 uint8 OpenCV HSV array (H in 0-179, S and V in 0-255)"""
+        if 'hsv' not in self._cache:
+            self._cache['hsv'] = self._freeze(cv2.cvtColor(self.rgb, cv2.COLOR_RGB2HSV))
+        return self._cache['hsv']
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Canny edge map of the grey image"""
+        if 'edges' not in self._cache:
+            self._cache['edges'] = self._freeze(cv2.Canny(self.gray, self.CANNY_LOW, self.CANNY_HIGH))
+        return self._cache['edges']
+
+    @property
+    def edge_density(self) -> float:
+        """Fraction of pixels on an edge"""
+        if 'edge_density' not in self._cache:
+            edges = self.edges
+            self._cache['edge_density'] = float(np.count_nonzero(edges)) / edges.size
+        return self._cache['edge_density']
+
+    @property
+    def stats(self) -> ImageStats:
+        """Histogram mean/variance/std of the RGB and luma channels"""
+        if 'stats' not in self._cache:
+            self._cache['stats'] = ImageStats(self.image)
+        return self._cache['stats']
+
+    @property
+    def gray_integral(self) -> IntegralImage:
+        """Summed-area tables of the grey image for O(1) region statistics"""
+        if 'gray_integral' not in self._cache:
+            self._cache['gray_integral'] = IntegralImage(self.gray)
+        return self._cache['gray_integral']
+
+    def rgb_pyramid(self, level: int) -> np.ndarray:
+        """RGB image downsampled by 2**level (level 0 is full resolution)"""
+        return self._pyramid('rgb', level)
+
+    def gray_pyramid(self, level: int) -> np.ndarray:
+        """Grey image downsampled by 2**level (level 0 is full resolution)"""
+        return self._pyramid('gray', level)
+
+    def _pyramid(self, name: str, level: int) -> np.ndarray:
+        if level <= 0:
+            return getattr(self, name)
+        key = f'{name}_pyr{level}'
+        if key not in self._cache:
+            previous = self._pyramid(name, level - 1)
+            if min(previous.shape[:2]) < 2:
+                return previous
+            self._cache[key] = self._freeze(cv2.pyrDown(previous))
+        return self._cache[key]
+
+    @staticmethod
+    def _freeze(array: np.ndarray) -> np.ndarray:
+        array.setflags(write=False)
+        return array
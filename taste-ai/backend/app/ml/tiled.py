@@ -0,0 +1,165 @@
+import numpy as np
+from PIL import Image
+import cv2
+from typing import Dict, List, Optional, Tuple
+from .image_stats import ImageStats, LEVELS
+from .local_stats import IntegralImage
+from .palette import PaletteBuilder, Palette
+from .burch_palette import BurchColorTable
+
+Region = Tuple[int, int, int, int]  # (y0, y1, x0, x1), clipped to the image
+
+class TiledImage:
+    """Bounded-memory measurements of a large image, streamed in row bands.
+
+    The image is walked once, top to bottom, in full-width bands sized so
+    that each band's working arrays (RGB, grey, HSV, edges, float64
+    integral tables and local-variance maps) fit in `memory_bytes`. Every
+    metric keeps a partial statistic that is merged across bands.
+
+    Merged exactly: the RGB, luma and saturation histograms (hence global
+    mean, variance and std), the strided palette sample, Burch colour
+    cell counts, region
+    mean/variance (rule of thirds, quadrants), mirror symmetry, and the
+    local-variance sums behind depth (up to float summation order).
+
+    Merged approximately: Canny edge density. Each band is padded by
+    EDGE_HALO rows, so only hysteresis chains that cross a band seam and
+    reach further than the halo can differ from a whole-image Canny.
+
+    Apart from the decoded source image itself, peak memory is bounded by
+    `memory_bytes` for any image height, and for widths up to
+    memory_bytes / (BYTES_PER_PIXEL * (1 + 2 * EDGE_HALO)).
+    """
+
+    # Working set per band pixel, including cv2/numpy temporaries
+    BYTES_PER_PIXEL = 96
+    EDGE_HALO = 16
+
+    def __init__(self, image: Image.Image, memory_bytes: int, regions: Dict[str, List[Region]],
+                 depth_window: int, canny_low: int, canny_high: int,
+                 color_table: Optional[BurchColorTable] = None):
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        self.size = image.size
+        self.mode = image.mode
+        w, h = image.size
+        self.depth_window = depth_window
+        self.canny_thresholds = (canny_low, canny_high)
+        self.color_table = color_table
+
+        self._rgb_histogram = np.zeros(768, dtype=np.int64)
+        self._luma_histogram = np.zeros(256, dtype=np.int64)
+        self._saturation_histogram = np.zeros(256, dtype=np.int64)
+        self._palette = PaletteBuilder(w * h)
+        self.color_cell_counts = np.zeros(len(color_table.cell_names) if color_table else 0, dtype=np.int64)
+        self._regions = {name: [_clip(r, h, w) for r in rs] for name, rs in regions.items()}
+        self._region_histograms = {
+            name: np.zeros((len(rs), 256), dtype=np.int64) for name, rs in self._regions.items()
+        }
+        self._edge_count = 0
+        self._mirror_diff_sum = 0
+        self._depth_var_sum = 0.0
+        self._depth_var_sq_sum = 0.0
+
+        halo_bottom = max(self.EDGE_HALO, depth_window - 1)
+        self.band_rows = max(1, memory_bytes // (max(1, w) * self.BYTES_PER_PIXEL) - self.EDGE_HALO - halo_bottom)
+        for y0 in range(0, h, self.band_rows):
+            y1 = min(h, y0 + self.band_rows)
+            top, bottom = max(0, y0 - self.EDGE_HALO), min(h, y1 + halo_bottom)
+            self._measure_band(image.crop((0, top, w, bottom)), y0, y1, top)
+
+    def _measure_band(self, band: Image.Image, y0: int, y1: int, top: int):
+        w, h = self.size
+        rgb = np.asarray(band)
+        own = rgb[y0 - top:y1 - top]
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        own_gray = gray[y0 - top:y1 - top]
+
+        # Global histograms and the palette sample
+        self._rgb_histogram += np.asarray(band.crop((0, y0 - top, w, y1 - top)).histogram(), dtype=np.int64)
+        self._luma_histogram += np.bincount(own_gray.ravel(), minlength=256)
+        saturation = cv2.cvtColor(own, cv2.COLOR_RGB2HSV)[:, :, 1]
+        self._saturation_histogram += np.bincount(saturation.ravel(), minlength=256)
+        self._palette.update(own.reshape(-1, 3))
+        if self.color_table is not None:
+            self.color_cell_counts += self.color_table.cell_counts(own)
+
+        # Edges of the padded band, counted on the band's own rows
+        edges = cv2.Canny(gray, *self.canny_thresholds)
+        self._edge_count += int(np.count_nonzero(edges[y0 - top:y1 - top]))
+
+        # Region grey histograms (exact sums and sums of squares)
+        for name, regions in self._regions.items():
+            for i, (ry0, ry1, rx0, rx1) in enumerate(regions):
+                oy0, oy1 = max(ry0, y0), min(ry1, y1)
+                if oy0 < oy1 and rx0 < rx1:
+                    block = gray[oy0 - top:oy1 - top, rx0:rx1]
+                    self._region_histograms[name][i] += np.bincount(block.ravel(), minlength=256)
+
+        # Left half against the mirrored right half, row by row
+        half = w // 2
+        left = own_gray[:, :half].astype(np.int16)
+        right = own_gray[:, w - half:][:, ::-1]
+        self._mirror_diff_sum += int(np.abs(left - right).sum(dtype=np.int64))
+
+        # Interior local variances whose window starts on the band's own rows
+        window = self.depth_window
+        end = min(y1, h - window)
+        if end > y0 and w > window:
+            chunk = gray[y0 - top:end - top + window - 1]
+            _, local_var = IntegralImage(chunk).local_mean_variance(window)
+            interior = local_var[:end - y0, :w - window]
+            self._depth_var_sum += float(interior.sum())
+            self._depth_var_sq_sum += float(np.square(interior).sum())
+
+    @property
+    def pixels(self) -> int:
+        return self.size[0] * self.size[1]
+
+    @property
+    def stats(self) -> ImageStats:
+        """Histogram mean/variance/std of the RGB and luma channels"""
+        return ImageStats.from_histograms(self._rgb_histogram, self._luma_histogram)
+
+    @property
+    def edge_density(self) -> float:
+        """Fraction of pixels on a Canny edge (approximate at band seams)"""
+        return self._edge_count / max(1, self.pixels)
+
+    @property
+    def saturation_std(self) -> float:
+        """Std of the OpenCV HSV saturation channel (0-255)"""
+        n = max(1, self._saturation_histogram.sum())
+        mean = self._saturation_histogram @ LEVELS / n
+        return float(np.sqrt(max(self._saturation_histogram @ (LEVELS * LEVELS) / n - mean * mean, 0.0)))
+
+    def palette(self, k: int = 5) -> Palette:
+        return self._palette.palette(k)
+
+    def region_stats(self, name: str) -> List[Tuple[float, float]]:
+        """(mean, variance) of each grey region registered under `name`"""
+        result = []
+        for hist in self._region_histograms[name]:
+            n = int(hist.sum())
+            if n == 0:
+                result.append((0.0, 0.0))
+                continue
+            mean = (hist @ LEVELS) / n
+            result.append((float(mean), float(max((hist @ (LEVELS * LEVELS)) / n - mean * mean, 0.0))))
+        return result
+
+    @property
+    def mirror_mean_diff(self) -> float:
+        """Mean |left - mirrored right| grey difference"""
+        w, h = self.size
+        return self._mirror_diff_sum / max(1, h * (w // 2))
+
+    @property
+    def depth_sums(self) -> Tuple[float, float, int]:
+        """Sum and sum of squares of interior local variances, and pixel count"""
+        return self._depth_var_sum, self._depth_var_sq_sum, self.pixels
+
+def _clip(region: Region, h: int, w: int) -> Region:
+    y0, y1, x0, x1 = region
+    return max(0, y0), min(h, y1), max(0, x0), min(w, x1)
@@ -0,0 +1,234 @@
+"""Visual embedding index of portfolio brands ("which brands does this look like?").
+
+The build step turns per-brand analyzer outputs into feature vectors and
+writes one index directory:
+
+    <brand_index_dir>/
+        manifest.json   feature names, standardization, row count
+        vectors.npy     (N, D) float32, rows L2-normalized (memory-mapped)
+        ids.json        row -> {"id", "website"}
+
+<brand_index_dir> is a symlink to a fresh sibling directory per build,
+swapped atomically, so a rebuild never rewrites files that a running
+server has memory-mapped.
+
+Features are standardized with the corpus mean/std stored in the manifest
+before normalization, so cosine similarity compares how brands differ from
+the average brand rather than the (always positive) raw magnitudes.
+Queries apply the same transform.
+
+Usage (from taste-ai/backend):
+    python -m app.services.brand_index [--source visual_analysis_results.json.gz] [--index-dir DIR]
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from app.ml.image_stats import ImageStats
+
+# What the brand crawler records (production_data/simple_analyzer.py):
+# mean and std of all pixel values, and the mean of each channel
+FEATURES = ("brightness", "pixel_std", "red", "green", "blue")
+# Rows scored per matrix-vector product; keeps each block cache-sized
+BLOCK_ROWS = 65536
+
+def brand_features(visual_analysis: Dict) -> np.ndarray:
+    """Feature vector from a brand's `visual_analysis` record"""
+    profile = visual_analysis.get("color_profile", {})
+    return np.array([
+        visual_analysis.get("average_brightness", 0.0),
+        # Recorded as "saturation" but computed as the pixel std
+        visual_analysis.get("average_saturation", 0.0),
+        profile.get("red", 0.0),
+        profile.get("green", 0.0),
+        profile.get("blue", 0.0),
+    ], dtype=np.float64)
+
+def image_features(image: Image.Image) -> np.ndarray:
+    """The same features measured on an image"""
+    stats = ImageStats(image)
+    return np.array([stats.mean, stats.std, *stats.channel_mean], dtype=np.float64)
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    # All-average rows stay zero and never rank above a real match
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+class EmbeddingIndex:
+    """Top-k cosine search over a memory-mapped, row-normalized float32 matrix.
+
+    Rows are scored block by block (one matrix product per BLOCK_ROWS rows)
+    and each block keeps only its k best with argpartition, so a query
+    touches every row once and never materializes or sorts N scores. At
+    1M rows of the 5 brand features that is a 20 MB scan per query.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(path, "ids.json")) as f:
+            self.ids: List[Dict] = json.load(f)
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode='r')
+        self.center = np.asarray(self.manifest["center"], dtype=np.float64)
+        self.scale = np.asarray(self.manifest["scale"], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def embed(self, features: np.ndarray) -> np.ndarray:
+        """(Q, D) raw features -> standardized, normalized float32 queries"""
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        return _normalize_rows((features - self.center) / self.scale).astype(np.float32)
+
+    def search(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[int, float]]]:
+        """(row, cosine) of the k nearest rows for each embedded query, best first"""
+        queries = np.atleast_2d(queries).astype(np.float32, copy=False)
+        k = min(k, len(self))
+        if k <= 0:
+            return [[] for _ in queries]
+        rows, scores = [], []
+        for start in range(0, len(self), BLOCK_ROWS):
+            block = self.vectors[start:start + BLOCK_ROWS] @ queries.T  # (rows, Q)
+            if block.shape[0] > k:
+                top = np.argpartition(block, -k, axis=0)[-k:]
+                block = np.take_along_axis(block, top, axis=0)
+            else:
+                top = np.broadcast_to(np.arange(block.shape[0])[:, None], block.shape)
+            rows.append(top + start)
+            scores.append(block)
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+
+        results = []
+        for q in range(queries.shape[0]):
+            best = np.argpartition(scores[:, q], -k)[-k:]
+            best = best[np.argsort(-scores[best, q], kind='stable')]
+            results.append([(int(rows[i, q]), float(scores[i, q])) for i in best])
+        return results
+
+    def most_similar(self, features: np.ndarray, k: int = 5) -> List[Dict]:
+        """Nearest indexed entries to one raw feature vector"""
+        return [
+            {**self.ids[row], "similarity": score}
+            for row, score in self.search(self.embed(features), k)[0]
+        ]
+
+def write_index(path: str, ids: List[Dict], features: np.ndarray,
+                feature_names: Iterable[str] = FEATURES) -> str:
+    """Standardize, normalize and write `features` (one row per id) to `path`
+
+    The files go to a new directory next to `path`, which is then pointed
+    at it (see _publish); readers of the previous index are unaffected.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim != 2 or features.shape[0] != len(ids):
+        raise ValueError(f"Expected {len(ids)} feature rows, got shape {features.shape}")
+    center = features.mean(axis=0)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    path = os.path.abspath(path)
+    parent, name = os.path.split(path)
+    os.makedirs(parent, exist_ok=True)
+    version = tempfile.mkdtemp(prefix=f".{name}-", dir=parent)
+    try:
+        os.chmod(version, 0o755)
+        _write_files(version, ids, features, center, scale, feature_names)
+        _publish(version, path)
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+    return path
+
+def _write_files(path: str, ids: List[Dict], features: np.ndarray, center: np.ndarray,
+                 scale: np.ndarray, feature_names: Iterable[str]):
+    vectors = np.lib.format.open_memmap(
+        os.path.join(path, "vectors.npy"), mode='w+', dtype=np.float32, shape=features.shape
+    )
+    # Chunked so building a large index never holds a float64 copy of it
+    for start in range(0, features.shape[0], BLOCK_ROWS):
+        chunk = (features[start:start + BLOCK_ROWS] - center) / scale
+        vectors[start:start + BLOCK_ROWS] = _normalize_rows(chunk)
+    vectors.flush()
+    del vectors
+
+    with open(os.path.join(path, "ids.json"), "w") as f:
+        json.dump(ids, f)
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump({
+            "features": list(feature_names),
+            "center": center.tolist(),
+            "scale": scale.tolist(),
+            "rows": len(ids),
+        }, f, indent=2)
+
+def _publish(version: str, path: str):
+    """Atomically point the `path` symlink at `version`, then drop the old build
+
+    Removing the old files is safe while a server still maps them: the
+    mapping keeps their data until it is closed.
+    """
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    if previous is None and os.path.isdir(path):
+        # An index built before builds were versioned
+        shutil.rmtree(path)
+    link = f"{version}.link"
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, path)
+    if previous is not None and previous != version:
+        shutil.rmtree(previous, ignore_errors=True)
+
+def build_brand_index(source: str, path: str) -> int:
+    """Index every successfully analyzed brand in a visual analysis results file"""
+    opener = gzip.open if source.endswith(".gz") else open
+    with opener(source, "rt") as f:
+        results = json.load(f)
+    ids, features = [], []
+    for company, record in results.items():
+        analysis = record.get("visual_analysis")
+        if record.get("status", "success") != "success" or not analysis:
+            continue
+        ids.append({"id": company, "website": record.get("website")})
+        features.append(brand_features(analysis))
+    write_index(path, ids, np.array(features).reshape(-1, len(FEATURES)))
+    return len(ids)
+
+_index: Optional[EmbeddingIndex] = None
+_index_path: Optional[str] = None
+_index_lock = threading.Lock()
+
+def get_brand_index() -> Optional[EmbeddingIndex]:
+    """The brand index from settings.brand_index_dir; None if not built
+
+    Opened once per build: after a rebuild swaps the directory, the next
+    call opens the new one.
+    """
+    global _index, _index_path
+    from app.core.config import settings
+    current = os.path.realpath(settings.brand_index_dir)
+    if current != _index_path:
+        with _index_lock:
+            if current != _index_path and os.path.exists(os.path.join(current, "manifest.json")):
+                _index = EmbeddingIndex(current)
+                _index_path = current
+    return _index
+
+def main():
+    from app.core.config import settings, DEFAULT_BRAND_SOURCE
+
+    parser = argparse.ArgumentParser(description="Build the portfolio brand embedding index")
+    parser.add_argument("--source", default=DEFAULT_BRAND_SOURCE,
+                        help="visual analysis results (.json or .json.gz)")
+    parser.add_argument("--index-dir", default=settings.brand_index_dir)
+    args = parser.parse_args()
+
+    count = build_brand_index(args.source, args.index_dir)
+    print(f"✅ Indexed {count} brands in {args.index_dir}")
+
+if __name__ == "__main__":
+    main()
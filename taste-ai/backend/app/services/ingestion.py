@@ -0,0 +1,188 @@
+import hashlib
+import io
+import math
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Callable, Dict, Optional, Union
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.routing import APIRoute
+from PIL import Image, UnidentifiedImageError
+from app.core.config import settings
+from app.ml.perceptual_hash import HASH_DECODE_SIDE, dhash
+
+# Largest reduction JPEG draft mode can apply while decoding (1/8 per side)
+MAX_DRAFT_REDUCTION = 8
+# PIL refuses to open images past twice this; let through the JPEGs that
+# ingest_upload accepts, which draft mode decodes to at most upload_max_pixels
+Image.MAX_IMAGE_PIXELS = settings.upload_max_pixels * MAX_DRAFT_REDUCTION ** 2
+# Multipart boundaries, part headers and form fields on top of the files
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# openapi_extra key declaring how many uploads a route accepts
+MAX_UPLOAD_FILES_KEY = "x-max-upload-files"
+
+class UploadRejected(Exception):
+    """Raised when an upload is too large, not an image, or unreadable"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+class IngestedUpload:
+    """An upload spooled to a bounded temporary file and probed from its header.
+
+    Only the header has been parsed: `format`, `width` and `height` are known
+    without decoding any pixels, and `sha256` was computed while streaming,
+    so cache lookups never need the bytes in memory.
+    """
+
+    def __init__(self, spool: SpooledTemporaryFile, size: int, sha256: str,
+                 format: Optional[str], width: int, height: int):
+        self.spool = spool
+        self.size = size
+        self.sha256 = sha256
+        self.format = format
+        self.width = width
+        self.height = height
+        self._perceptual_hash: Optional[int] = None
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    def read(self) -> bytes:
+        """The full upload (e.g. to hand to a worker process)"""
+        self.spool.seek(0)
+        return self.spool.read()
+
+    def open_image(self, max_side: Optional[int] = None) -> Image.Image:
+        """Decode the upload, downscaling oversized JPEGs while decoding"""
+        self.spool.seek(0)
+        return decode_image(self.spool, max_side=max_side)
+
+    def perceptual_hash(self) -> int:
+        """dHash of the upload, decoded at low resolution (computed once)"""
+        if self._perceptual_hash is None:
+            self.spool.seek(0)
+            self._perceptual_hash = dhash(decode_image(self.spool, max_side=HASH_DECODE_SIDE))
+        return self._perceptual_hash
+
+    def close(self):
+        self.spool.close()
+
+async def ingest_upload(file: UploadFile, max_bytes: Optional[int] = None,
+                        max_pixels: Optional[int] = None) -> IngestedUpload:
+    """Stream `file` into a bounded spool and probe its image header.
+
+    Raises UploadRejected (413) once more than `max_bytes` have been read
+    from `file`, or when the header reports more than `max_pixels` pixels
+    and the image cannot be downscaled while decoding; 415 if it is not an
+    image. The request body has already been received at this point; it
+    is UploadLimitRoute that stops an oversized body while it arrives.
+    """
+    max_bytes = max_bytes or settings.upload_max_bytes
+    max_pixels = max_pixels or settings.upload_max_pixels
+    spool = SpooledTemporaryFile(max_size=settings.upload_spool_bytes)
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        while True:
+            chunk = await file.read(settings.upload_chunk_bytes)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(413, f"Upload exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            spool.write(chunk)
+
+        spool.seek(0)
+        try:
+            # Lazy open: reads the header only
+            with Image.open(spool) as probe:
+                format, (width, height) = probe.format, probe.size
+        except Image.DecompressionBombError as e:
+            raise UploadRejected(413, str(e))
+        except (UnidentifiedImageError, OSError) as e:
+            raise UploadRejected(415, f"Unreadable image: {e}")
+
+        pixels = width * height
+        limit = max_pixels * MAX_DRAFT_REDUCTION ** 2 if format == 'JPEG' else max_pixels
+        if pixels > limit:
+            raise UploadRejected(413, f"Image is {width}x{height}; at most {max_pixels} pixels are accepted")
+        return IngestedUpload(spool, size, digest.hexdigest(), format, width, height)
+    except BaseException:
+        spool.close()
+        raise
+
+def max_upload_files(count: int) -> Dict:
+    """openapi_extra for a route that accepts up to `count` uploads"""
+    return {MAX_UPLOAD_FILES_KEY: count}
+
+class UploadLimitRoute(APIRoute):
+    """Route that rejects an oversized request body before it is parsed.
+
+    FastAPI receives and spools the whole multipart body before the
+    endpoint runs, so ingest_upload only sees an oversized file after it
+    has arrived. This route answers 413 as soon as the Content-Length, or
+    the bytes actually received, exceed UPLOAD_MAX_BYTES for each upload
+    the route accepts (see max_upload_files; one by default), capped at
+    UPLOAD_MAX_REQUEST_BYTES in total.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        files = (self.openapi_extra or {}).get(MAX_UPLOAD_FILES_KEY, 1)
+
+        async def limited_handler(request: Request) -> Response:
+            limit = min(settings.upload_max_bytes * files, settings.upload_max_request_bytes)
+            limit += MULTIPART_OVERHEAD_BYTES
+            length = request.headers.get("content-length", "")
+            if length.isdigit() and int(length) > limit:
+                raise HTTPException(status_code=413, detail=f"Request body exceeds {limit} bytes")
+            return await handler(Request(request.scope, _limited_receive(request.receive, limit)))
+
+        return limited_handler
+
+def _limited_receive(receive: Callable, limit: int) -> Callable:
+    """Wrap an ASGI receive to fail once the body exceeds `limit` bytes"""
+    received = 0
+
+    async def limited():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail=f"Request body exceeds {limit} bytes")
+        return message
+
+    return limited
+
+def decode_image(source: Union[BinaryIO, bytes], max_pixels: Optional[int] = None,
+                 max_side: Optional[int] = None) -> Image.Image:
+    """Decode an image to at most `max_pixels` pixels.
+
+    JPEGs are reduced by the decoder itself (draft mode, DCT scaling by up
+    to 1/8), which is much faster than decoding at full size; whatever
+    reduction remains is applied with a box filter. `max_side` lets the
+    JPEG decoder go further when the caller only needs that resolution
+    (the result still has at least `max_side` on its longest side).
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    max_pixels = max_pixels or settings.upload_max_pixels
+    image = Image.open(source)
+    width, height = image.size
+    factor = max(1.0, math.sqrt(width * height / max_pixels))
+    if max_side:
+        factor = max(factor, max(width, height) / max_side)
+    if factor > 1 and image.format == 'JPEG':
+        # Draft picks the largest DCT reduction that keeps at least this size
+        image.draft('RGB', (math.ceil(width / factor), math.ceil(height / factor)))
+    image.load()
+    remaining = math.ceil(math.sqrt(image.size[0] * image.size[1] / max_pixels))
+    if remaining > 1:
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image = image.reduce(remaining)
+    return image
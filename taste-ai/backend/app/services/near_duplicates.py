@@ -0,0 +1,195 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.ml.perceptual_hash import HASH_BITS, hamming
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Persistence is optional
+    aioredis = None
+
+@lru_cache(maxsize=None)
+def _flip_masks(bits: int, radius: int) -> Tuple[int, ...]:
+    """Every `bits`-wide mask with at most `radius` bits set"""
+    return tuple(
+        sum(1 << bit for bit in flipped)
+        for r in range(radius + 1)
+        for flipped in combinations(range(bits), r)
+    )
+
+class NearDuplicateIndex:
+    """Perceptual-hash index with Hamming-radius lookup (multi-index hashing).
+
+    Each 64-bit hash is split into m disjoint chunks of about log2(N) bits
+    for N = `max_entries`, so a chunk value matches few entries. Two hashes
+    within r bits differ in at most r // m bits of some chunk (pigeonhole),
+    so a query looks up every value within r // m bits of each of its
+    chunks and only verifies the entries found there, instead of scanning
+    the whole index.
+
+    Entries map a content digest (SHA-256 of the upload) to its hash and
+    are persisted in a Redis sorted set scored by when they were added.
+    The in-memory index is loaded from it on first use, so every API
+    process sees entries written before it started, plus its own.
+
+    Entries expire after `ttl_seconds` (the result cache TTL: past it the
+    analysis they point to is gone) and at most `max_entries` are kept,
+    oldest evicted first, both in memory and in Redis.
+    """
+
+    # Seconds to skip Redis after a connection error
+    REDIS_BACKOFF_SECONDS = 30
+
+    def __init__(self, max_distance: int, ttl_seconds: int, max_entries: int,
+                 redis_url: Optional[str] = None, key: str = "tasteai:phashes"):
+        self.max_distance = max(0, max_distance)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.key = key
+        # More than max_distance + 1 chunks only makes each one less selective
+        chunks = min(self.max_distance + 1, max(1, round(HASH_BITS / math.log2(max(2, self.max_entries)))))
+        self._chunk_bounds = [(HASH_BITS * i // chunks, HASH_BITS * (i + 1) // chunks) for i in range(chunks)]
+        self._tables: List[Dict[int, Set[int]]] = [defaultdict(set) for _ in range(chunks)]
+        self._digests: Dict[int, Set[str]] = defaultdict(set)
+        # digest -> (hash, time added), oldest first
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._redis_url = redis_url if aioredis is not None else None
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _chunks(self, phash: int):
+        for i, (lo, hi) in enumerate(self._chunk_bounds):
+            yield i, (phash >> lo) & ((1 << (hi - lo)) - 1)
+
+    def _insert(self, phash: int, digest: str, added: float):
+        if digest in self._entries:
+            return
+        if not self._digests[phash]:
+            for i, chunk in self._chunks(phash):
+                self._tables[i][chunk].add(phash)
+        self._digests[phash].add(digest)
+        self._entries[digest] = (phash, added)
+
+    def _remove(self, digest: str):
+        phash, _ = self._entries.pop(digest)
+        self._digests[phash].discard(digest)
+        if self._digests[phash]:
+            return
+        del self._digests[phash]
+        for i, chunk in self._chunks(phash):
+            table = self._tables[i]
+            table[chunk].discard(phash)
+            if not table[chunk]:
+                del table[chunk]
+
+    def _evict(self, now: float):
+        """Drop expired entries and the oldest beyond max_entries"""
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            digest, (_, added) = next(iter(self._entries.items()))
+            if added > cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._remove(digest)
+
+    def search(self, phash: int, radius: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(distance, digest) of indexed entries within `radius` bits, nearest first"""
+        radius = self.max_distance if radius is None else min(radius, self.max_distance)
+        sub_radius = radius // len(self._chunk_bounds)
+        candidates = set()
+        for i, chunk in self._chunks(phash):
+            lo, hi = self._chunk_bounds[i]
+            table = self._tables[i]
+            for mask in _flip_masks(hi - lo, sub_radius):
+                bucket = table.get(chunk ^ mask)
+                if bucket:
+                    candidates |= bucket
+        matches = []
+        for candidate in candidates:
+            distance = hamming(phash, candidate)
+            if distance <= radius:
+                matches.extend((distance, digest) for digest in self._digests[candidate])
+        return sorted(matches)
+
+    async def query(self, phash: int, radius: Optional[int] = None) -> List[Tuple[int, str]]:
+        await self._ensure_loaded()
+        self._evict(time.time())
+        return self.search(phash, radius)
+
+    async def add(self, phash: int, digest: str):
+        """Index `digest` under `phash` and persist it"""
+        await self._ensure_loaded()
+        if digest in self._entries:
+            return
+        now = time.time()
+        self._insert(phash, digest, now)
+        self._evict(now)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.zadd(self.key, {f"{phash:016x}:{digest}": now})
+                    pipe.zremrangebyscore(self.key, '-inf', now - self.ttl_seconds)
+                    pipe.zremrangebyrank(self.key, 0, -self.max_entries - 1)
+                    await pipe.execute()
+            except Exception as e:
+                self._redis_failed(e)
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if self._redis_url is None:
+                self._loaded = True
+                return
+            client = self._redis_client()
+            if client is None:
+                return  # Backing off; retried on a later call
+            try:
+                entries = await client.zrangebyscore(
+                    self.key, time.time() - self.ttl_seconds, '+inf', withscores=True
+                )
+            except Exception as e:
+                self._redis_failed(e)
+                return
+            for member, added in entries:
+                if isinstance(member, bytes):
+                    member = member.decode()
+                phash, digest = member.split(':', 1)
+                self._insert(int(phash, 16), digest, added)
+            # Entries added locally while Redis was unreachable are newer
+            self._entries = OrderedDict(sorted(self._entries.items(), key=lambda item: item[1][1]))
+            self._evict(time.time())
+            self._loaded = True
+
+    def _redis_client(self):
+        if self._redis_url is None or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self._redis_url, socket_connect_timeout=0.25, socket_timeout=0.25
+            )
+        return self._redis
+
+    def _redis_failed(self, e: Exception):
+        self._redis_retry_at = time.monotonic() + self.REDIS_BACKOFF_SECONDS
+        print(f"⚠️ Near-duplicate index Redis persistence unavailable: {e}")
+
+# Global index instance
+near_duplicate_index = NearDuplicateIndex(
+    max_distance=settings.near_duplicate_index_radius,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    max_entries=settings.near_duplicate_index_max_entries,
+    redis_url=settings.redis_url if settings.result_cache_redis_enabled else None,
+)
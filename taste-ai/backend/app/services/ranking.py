@@ -0,0 +1,54 @@
+import heapq
+import math
+from typing import Dict, List, Sequence
+
+class TopKRanking:
+    """Single-pass top-k selection and summary statistics per criterion.
+
+    Keeps a bounded min-heap of size k for every criterion, so adding N
+    entries costs O(N log k) time and O(k) memory per criterion. Running
+    mean/variance use Welford's update. Ties go to the earlier entry.
+    """
+
+    def __init__(self, k: int, criteria: Sequence[str]):
+        self.k = k
+        self.criteria = tuple(criteria)
+        self._heaps: Dict[str, list] = {c: [] for c in self.criteria}
+        self._stats = {c: {"count": 0, "mean": 0.0, "m2": 0.0, "min": math.inf, "max": -math.inf}
+                       for c in self.criteria}
+
+    def add(self, index: int, entry: Dict):
+        for criterion in self.criteria:
+            value = float(entry[criterion])
+            item = (value, -index, entry)
+            heap = self._heaps[criterion]
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+            stats = self._stats[criterion]
+            stats["count"] += 1
+            delta = value - stats["mean"]
+            stats["mean"] += delta / stats["count"]
+            stats["m2"] += delta * (value - stats["mean"])
+            stats["min"] = min(stats["min"], value)
+            stats["max"] = max(stats["max"], value)
+
+    def top(self, criterion: str) -> List[Dict]:
+        """Best-first entries for one criterion"""
+        heap = self._heaps[criterion]
+        return [entry for _, _, entry in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+    def summary(self, criterion: str) -> Dict[str, float]:
+        stats = self._stats[criterion]
+        count = stats["count"]
+        if count == 0:
+            return {"count": 0, "mean": None, "std": None, "min": None, "max": None}
+        return {
+            "count": count,
+            "mean": stats["mean"],
+            "std": math.sqrt(stats["m2"] / count),
+            "min": stats["min"],
+            "max": stats["max"],
+        }
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+import numpy as np
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis tier is optional
+    aioredis = None
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class ResultCache:
+    """Read-through, content-addressed cache for scoring results.
+
+    Keys are SHA-256 of the upload bytes plus engine version and a variant
+    (analysis depth, market segment, ...). Lookups go to an in-process LRU
+    bounded by serialized size, then to Redis with a TTL, then compute.
+    Concurrent requests for the same key share a single computation.
+    """
+
+    # Seconds to skip Redis after a connection error
+    REDIS_BACKOFF_SECONDS = 30
+
+    def __init__(self, max_memory_bytes: int, ttl_seconds: int,
+                 redis_url: Optional[str] = None, namespace: str = "tasteai:result"):
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis_url = redis_url if aioredis is not None else None
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self.counters = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "redis_errors": 0,
+            "evictions": 0,
+        }
+
+    def make_key(self, image_data: bytes, engine_version: str, variant: str = "") -> str:
+        return self.key_for_digest(hashlib.sha256(image_data).hexdigest(), engine_version, variant)
+
+    def key_for_digest(self, digest: str, engine_version: str, variant: str = "") -> str:
+        """Key for content whose SHA-256 hex digest is already known"""
+        return f"{self.namespace}:{engine_version}:{variant}:{digest}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached value for `key` from either tier, or None (never computes)"""
+        payload = self._memory_get(key)
+        if payload is None:
+            payload = await self._redis_get(key)
+            if payload is not None:
+                self._memory_put(key, payload)
+        return json.loads(payload) if payload is not None else None
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, computing it at most once
+
+        The lookup and computation run in a task shared by every caller of
+        the key. A caller that is cancelled only stops waiting for it, so
+        the others (and the cache) still get the result.
+        """
+        cached = self._memory_get(key)
+        if cached is not None:
+            self.counters["memory_hits"] += 1
+            return json.loads(cached)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._fill(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fill_done(key, done))
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        payload = await self._redis_get(key)
+        if payload is not None:
+            self.counters["redis_hits"] += 1
+            self._memory_put(key, payload)
+            return json.loads(payload)
+        self.counters["misses"] += 1
+        value = await compute()
+        payload = json.dumps(value, default=_json_default).encode()
+        self._memory_put(key, payload)
+        await self._redis_set(key, payload)
+        return json.loads(payload)
+
+    def _fill_done(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Callers re-raise; mark retrieved so an unobserved error isn't logged
+            task.exception()
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.counters["memory_hits"] + self.counters["redis_hits"] + self.counters["coalesced"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._lru),
+            "memory_bytes": self._memory_bytes,
+            "inflight": len(self._inflight),
+        }
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        payload = self._lru.get(key)
+        if payload is not None:
+            self._lru.move_to_end(key)
+        return payload
+
+    def _memory_put(self, key: str, payload: bytes):
+        if len(payload) > self.max_memory_bytes:
+            return
+        previous = self._lru.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._lru[key] = payload
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.counters["evictions"] += 1
+
+    def _redis_client(self):
+        if self._redis_url is None or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self._redis_url, socket_connect_timeout=0.25, socket_timeout=0.25
+            )
+        return self._redis
+
+    def _redis_failed(self, e: Exception):
+        self.counters["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + self.REDIS_BACKOFF_SECONDS
+        print(f"⚠️ Result cache Redis tier unavailable: {e}")
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            return await client.get(key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def _redis_set(self, key: str, payload: bytes):
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.set(key, payload, ex=self.ttl_seconds)
+        except Exception as e:
+            self._redis_failed(e)
+
+# Global cache instance
+result_cache = ResultCache(
+    max_memory_bytes=settings.result_cache_memory_bytes,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    redis_url=settings.redis_url if settings.result_cache_redis_enabled else None,
+)
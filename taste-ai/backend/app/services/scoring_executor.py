@@ -0,0 +1,98 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+class ScoringQueueFull(Exception):
+    """Raised when the scoring executor cannot accept more work"""
+
+class ScoringExecutor:
+    """Bounded process pool that runs CPU-bound scoring off the event loop.
+
+    Workers preload the analysis engines once at start-up. At most
+    `max_workers + max_queue` jobs are accepted at a time; further
+    submissions fail fast with `ScoringQueueFull` instead of piling up
+    behind the slowest image.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        """Jobs accepted and not yet finished"""
+        return self._pending
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running on a worker"""
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker"""
+        return max(0, self._pending - self.max_workers)
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_preload_engines,
+            )
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    async def submit(self, fn: Callable, *args) -> Any:
+        """Run `fn(*args)` in a worker process, rejecting when saturated"""
+        if self._pending >= self.capacity:
+            raise ScoringQueueFull(
+                f"Scoring queue full ({self._pending}/{self.capacity} jobs pending)"
+            )
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = self._pool.submit(fn, *args)
+        self._pending += 1
+        # Counted until the worker finishes, even if the caller stops waiting
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._job_done))
+        return await asyncio.wrap_future(job)
+
+    def _job_done(self):
+        self._pending -= 1
+
+def _preload_engines():
+    """Worker initializer: import the engines so the first job is warm"""
+    from app.ml.advanced_aesthetic import advanced_engine  # noqa: F401
+
+def analyze_image_bytes(image_data: bytes, analysis_depth: str = 'comprehensive') -> Tuple[Dict, Dict[str, float], int]:
+    """Decode and analyze at the given depth (executes in a worker)
+    
+    Returns the analysis, per-stage timings in seconds (which the parent
+    process records since worker metrics are not scraped) and the image's
+    perceptual hash for the near-duplicate index.
+    """
+    from app.ml.advanced_aesthetic import advanced_engine
+    from app.ml.perceptual_hash import dhash
+    from app.services.ingestion import decode_image
+    start = time.perf_counter()
+    image = decode_image(image_data)
+    timings = {'decode': time.perf_counter() - start}
+    return advanced_engine.analyze(image, analysis_depth, timings=timings), timings, dhash(image)
+
+# Global executor instance
+scoring_executor = ScoringExecutor(
+    max_workers=settings.scoring_workers,
+    max_queue=settings.scoring_queue_size,
+)
@@ -3,6 +3,8 @@ import numpy as np
 from typing import Tuple, List
 import io
 import base64
+from app.ml.palette import extract_palette
+from app.ml.image_stats import ImageStats
 
 def resize_image(image: Image.Image, size: Tuple[int, int] = (224, 224)) -> Image.Image:
     return image.resize(size, Image.Resampling.LANCZOS)
@@ -13,28 +15,13 @@ def normalize_image(image: Image.Image) -> Image.Image:
     return image
 
 def extract_dominant_colors(image: Image.Image, num_colors: int = 5) -> List[str]:
-    image = image.resize((100, 100))
-    result = image.quantize(colors=num_colors)
-    palette = result.getpalette()
-    
-    colors = []
-    for i in range(num_colors):
-        r = palette[i*3]
-        g = palette[i*3 + 1]
-        b = palette[i*3 + 2]
-        colors.append(f"#{r:02x}{g:02x}{b:02x}")
-    
-    return colors
+    return extract_palette(image, k=num_colors).to_hex()
 
 def calculate_brightness(image: Image.Image) -> float:
-    grayscale = image.convert('L')
-    stat = np.array(grayscale)
-    return np.mean(stat) / 255.0
+    return ImageStats(image).luma_mean / 255.0
 
 def calculate_contrast(image: Image.Image) -> float:
-    grayscale = image.convert('L')
-    stat = np.array(grayscale)
-    return np.std(stat) / 255.0
+    return ImageStats(image).luma_std / 255.0
 
 def image_to_base64(image: Image.Image) -> str:
     buffer = io.BytesIO()
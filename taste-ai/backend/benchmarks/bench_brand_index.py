@@ -0,0 +1,56 @@
+"""Benchmark: top-k cosine search over the memory-mapped brand index.
+
+Writes synthetic indexes of 10k, 100k and 1M brand-feature rows to a
+temporary directory and times EmbeddingIndex.search (blocked matrix
+products + argpartition) against a full sort of all scores. The first
+query of each size warms the page cache and is not timed.
+
+Usage (from taste-ai/backend):
+    python -m benchmarks.bench_brand_index
+"""
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.brand_index import EmbeddingIndex, FEATURES, write_index
+
+SIZES = [10_000, 100_000, 1_000_000]
+TOP_K = 10
+QUERIES = 50
+
+def make_features(rows: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 255, (rows, len(FEATURES)))
+
+def full_sort_seconds(index: EmbeddingIndex, queries: np.ndarray) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        scores = np.asarray(index.vectors) @ q
+        np.argsort(-scores)[:TOP_K]
+    return (time.perf_counter() - start) / len(queries)
+
+def search_seconds(index: EmbeddingIndex, queries: np.ndarray) -> float:
+    index.search(queries[0], TOP_K)
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q, TOP_K)
+    return (time.perf_counter() - start) / len(queries)
+
+def main():
+    print(f"{'rows':>10} {'full sort (ms)':>15} {'search (ms)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in SIZES:
+            path = os.path.join(tmp, str(rows))
+            write_index(path, [{"id": str(i)} for i in range(rows)], make_features(rows))
+            index = EmbeddingIndex(path)
+            queries = index.embed(make_features(QUERIES, seed=1))
+            fast = search_seconds(index, queries)
+            slow = full_sort_seconds(index, queries)
+            print(f"{rows:>10,} {slow * 1000:>15.2f} {fast * 1000:>12.2f} {slow / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark: per-pixel local variance loop vs. IntegralImage kernel.
+
+Times CompositionAnalyzer._analyze_depth before (nested Python loop over
+every pixel) and after (summed-area tables) at 0.25, 1, 4 and 12 MP.
+The legacy loop is timed on a strip of rows and extrapolated to the full
+frame, since running it on 12 MP takes minutes.
+
+Usage (from taste-ai/backend):
+    python -m benchmarks.bench_local_stats
+"""
+import sys
+import os
+import time
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.advanced_aesthetic import CompositionAnalyzer
+from app.ml.local_stats import IntegralImage
+
+SIZES_MP = [0.25, 1, 4, 12]
+ASPECT = 4 / 3
+STRIP_ROWS = 16
+KERNEL_SIZE = 5
+
+def make_image(megapixels: float, seed: int = 0) -> np.ndarray:
+    h = int(round(np.sqrt(megapixels * 1e6 / ASPECT)))
+    w = int(round(h * ASPECT))
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (h, w), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (9, 9), 0)
+
+def legacy_loop_seconds_per_row(img: np.ndarray) -> float:
+    """Time the original nested loop on a strip of rows"""
+    k = KERNEL_SIZE
+    variance_map = np.zeros_like(img, dtype=float)
+    start = time.perf_counter()
+    for i in range(k, k + STRIP_ROWS):
+        for j in range(k, img.shape[1] - k):
+            variance_map[i, j] = np.var(img[i-k:i+k, j-k:j+k])
+    return (time.perf_counter() - start) / STRIP_ROWS
+
+def vectorized_seconds(img: np.ndarray, repeats: int = 3) -> float:
+    analyzer = CompositionAnalyzer()
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        analyzer._analyze_depth(IntegralImage(img))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    print(f"{'size':>8} {'pixels':>12} {'legacy (s)':>12} {'integral (ms)':>14} {'speedup':>10}")
+    for mp in SIZES_MP:
+        img = make_image(mp)
+        legacy = legacy_loop_seconds_per_row(img) * (img.shape[0] - 2 * KERNEL_SIZE)
+        fast = vectorized_seconds(img)
+        print(f"{mp:>6}MP {img.size:>12,} {legacy:>12.1f} {fast * 1000:>14.1f} {legacy / fast:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
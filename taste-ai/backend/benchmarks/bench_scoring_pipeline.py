@@ -0,0 +1,263 @@
+"""Benchmark suite: every scoring engine over the synthetic test corpus.
+
+Generates the corpus from taste-ai/create_advanced_test_images.py with a
+fixed seed, resizes it to several resolutions (longest side), and runs
+each engine on every image:
+
+    advanced_basic / advanced_detailed / advanced_comprehensive
+                    AdvancedAestheticEngine.analyze (per-stage timings)
+    burch           BurchAestheticEngine.score_aesthetic
+    simple          SimpleAestheticModel.predict
+    elite_backend   EliteAestheticEngine in backend/main.py
+    elite_core      EliteAestheticEngine in core/api/main.py (needs Redis)
+
+For each engine and resolution it reports latency percentiles per stage
+(and `total`), images/sec, the tracemalloc peak of one pass (Python and
+numpy allocations) and the process peak RSS so far. Engines that cannot
+be loaded here are recorded as skipped with the reason.
+
+Results are written as JSON. `--baseline` compares a run against an
+earlier one, and `--compare OLD NEW` compares two saved files; both flag
+latency, throughput and memory changes beyond `--threshold` and exit 1
+if any are found.
+
+Usage (from taste-ai/backend):
+    python -m benchmarks.bench_scoring_pipeline [--sides 512 1024 2048] [--output results.json]
+    python -m benchmarks.bench_scoring_pipeline --baseline old.json [--threshold 0.1]
+    python -m benchmarks.bench_scoring_pipeline --compare old.json new.json
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from PIL import Image
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TASTE_AI_DIR = os.path.dirname(BACKEND_DIR)
+REPO_DIR = os.path.dirname(TASTE_AI_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, TASTE_AI_DIR)
+
+SIDES = [512, 1024, 2048]
+SEED = 0
+REPEATS = 3
+THRESHOLD = 0.10
+PERCENTILES = (50, 90, 99)
+
+# Engine -> image -> result, adding per-stage seconds to the timings dict
+Engine = Callable[[Image.Image, Dict[str, float]], object]
+
+def make_corpus(sides: List[int], seed: int = SEED) -> List[Tuple[str, int, Image.Image]]:
+    """(name, side, image) for every generated test image at every side"""
+    from create_advanced_test_images import create_advanced_test_images
+
+    random.seed(seed)
+    np.random.seed(seed)
+    base = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            os.chdir(tmp)
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_advanced_test_images()
+            folder = os.path.join(tmp, 'test-images', 'advanced')
+            for name in sorted(os.listdir(folder)):
+                with Image.open(os.path.join(folder, name)) as image:
+                    base.append((os.path.splitext(name)[0], image.convert('RGB')))
+        finally:
+            os.chdir(cwd)
+
+    corpus = []
+    for side in sides:
+        for name, image in base:
+            scale = side / max(image.size)
+            size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+            corpus.append((name, side, image.resize(size, Image.Resampling.LANCZOS)))
+    return corpus
+
+def _load_module(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _advanced(depth: str) -> Engine:
+    from app.ml.advanced_aesthetic import advanced_engine
+    return lambda image, timings: advanced_engine.analyze(image, depth, timings=timings)
+
+def _burch() -> Engine:
+    from app.ml.burch_models import burch_engine
+    return lambda image, timings: burch_engine.score_aesthetic(image)
+
+def _simple() -> Engine:
+    from app.api.aesthetic_simple import SimpleAestheticModel
+    model = SimpleAestheticModel()
+    return lambda image, timings: model.predict(image)
+
+def _elite(path: str, name: str) -> Callable[[], Engine]:
+    def load() -> Engine:
+        engine = _load_module(name, os.path.join(REPO_DIR, path)).engine
+        return lambda image, timings: engine.analyze(image)
+    return load
+
+ENGINES: Dict[str, Callable[[], Engine]] = {
+    'advanced_basic': lambda: _advanced('basic'),
+    'advanced_detailed': lambda: _advanced('detailed'),
+    'advanced_comprehensive': lambda: _advanced('comprehensive'),
+    'burch': _burch,
+    'simple': _simple,
+    'elite_backend': _elite('backend/main.py', 'elite_backend_main'),
+    'elite_core': _elite('core/api/main.py', 'elite_core_main'),
+}
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    ms = np.asarray(samples) * 1000
+    summary = {f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES}
+    summary["mean_ms"] = float(ms.mean())
+    return summary
+
+def run_engine(engine: Engine, images: List[Image.Image], repeats: int) -> Dict:
+    """Latency per stage, throughput and memory of one engine over `images`"""
+    engine(images[0], {})  # Warm up lazy models and caches
+
+    stages: Dict[str, List[float]] = {}
+    totals = []
+    for _ in range(repeats):
+        for image in images:
+            timings: Dict[str, float] = {}
+            start = time.perf_counter()
+            engine(image, timings)
+            totals.append(time.perf_counter() - start)
+            for stage, seconds in timings.items():
+                stages.setdefault(stage, []).append(seconds)
+
+    tracemalloc.start()
+    for image in images:
+        engine(image, {})
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "images": len(totals),
+        "images_per_sec": len(totals) / sum(totals),
+        "stages": {
+            "total": _latency_summary(totals),
+            **{stage: _latency_summary(samples) for stage, samples in sorted(stages.items())},
+        },
+        "tracemalloc_peak_bytes": traced_peak,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+def run_suite(sides: List[int], engines: List[str], repeats: int, seed: int) -> Dict:
+    corpus = make_corpus(sides, seed)
+    results = {
+        "meta": {
+            "sides": sides,
+            "seed": seed,
+            "repeats": repeats,
+            "corpus_images": len(corpus) // len(sides),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "engines": {},
+    }
+    for name in engines:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                engine = ENGINES[name]()
+        except Exception as e:
+            results["engines"][name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"⚠️ {name}: skipped ({e})")
+            continue
+        by_side = {}
+        for side in sides:
+            images = [image for _, s, image in corpus if s == side]
+            by_side[str(side)] = result = run_engine(engine, images, repeats)
+            total = result["stages"]["total"]
+            print(f"{name:>24} {side:>6}px {total['p50_ms']:>10.1f} {total['p90_ms']:>10.1f} "
+                  f"{result['images_per_sec']:>10.1f} {result['tracemalloc_peak_bytes'] / 2**20:>10.1f}")
+        results["engines"][name] = by_side
+    return results
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Regressions of `current` against `baseline` beyond `threshold` (a fraction)"""
+    regressions = []
+
+    def check(label: str, old: float, new: float, higher_is_worse: bool = True):
+        if not old:
+            return
+        change = (new - old) / old
+        if (change if higher_is_worse else -change) > threshold:
+            regressions.append(f"{label}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+
+    for name, sides in current["engines"].items():
+        old_sides = baseline["engines"].get(name)
+        if "skipped" in sides or not old_sides or "skipped" in old_sides:
+            continue
+        for side, result in sides.items():
+            old = old_sides.get(side)
+            if old is None:
+                continue
+            prefix = f"{name} @ {side}px"
+            check(f"{prefix} images/sec", old["images_per_sec"], result["images_per_sec"], higher_is_worse=False)
+            for stage, summary in result["stages"].items():
+                for stat in ("p50_ms", "p90_ms"):
+                    if stage in old["stages"]:
+                        check(f"{prefix} {stage} {stat}", old["stages"][stage][stat], summary[stat])
+            check(f"{prefix} tracemalloc peak", old["tracemalloc_peak_bytes"], result["tracemalloc_peak_bytes"])
+    return regressions
+
+def report(regressions: List[str], threshold: float) -> int:
+    if not regressions:
+        print(f"✅ No regressions beyond {threshold:.0%}")
+        return 0
+    print(f"⚠️ {len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for line in regressions:
+        print(f"  • {line}")
+    return 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring engines on the synthetic test corpus")
+    parser.add_argument("--sides", type=int, nargs="+", default=SIDES, help="longest image sides to test")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare this run against a saved results JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved results files")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="regression threshold (fraction)")
+    args = parser.parse_args()
+
+    if args.compare:
+        old, new = (json.load(open(path)) for path in args.compare)
+        sys.exit(report(compare(old, new, args.threshold), args.threshold))
+
+    print(f"{'engine':>24} {'side':>8} {'p50 (ms)':>10} {'p90 (ms)':>10} {'img/s':>10} {'peak MiB':>10}")
+    results = run_suite(args.sides, args.engines, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        sys.exit(report(compare(baseline, results, args.threshold), args.threshold))
+
+if __name__ == "__main__":
+    main()
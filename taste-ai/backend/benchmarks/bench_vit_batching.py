@@ -0,0 +1,79 @@
+"""Benchmark: ViT micro-batching throughput vs. latency.
+
+Runs AestheticVisionTransformer (random weights, same architecture as
+google/vit-base-patch16-224, so no download) behind DynamicBatcher with a
+closed-loop load of concurrent clients, for several max batch size / max
+wait settings. max_batch_size=1 is the unbatched baseline.
+
+Usage (from taste-ai/backend):
+    python -m benchmarks.bench_vit_batching [--clients 16] [--requests 64] [--threads N]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import time
+import numpy as np
+import torch
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.models import AestheticVisionTransformer
+from app.ml.batching import DynamicBatcher
+
+SETTINGS = [(1, 0.0), (4, 4.0), (8, 8.0), (16, 8.0), (16, 20.0)]
+
+def make_images(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)) for _ in range(count)]
+
+async def run_setting(model, images, clients: int, max_batch: int, max_wait_ms: float):
+    batcher = DynamicBatcher(model, max_batch_size=max_batch, max_wait_ms=max_wait_ms)
+    latencies = []
+    work = iter(images)
+
+    async def client():
+        for image in work:
+            start = time.perf_counter()
+            await batcher.submit(image)
+            latencies.append(time.perf_counter() - start)
+
+    # Warm-up batch so lazy initialisation isn't timed
+    await batcher.submit(images[0])
+    batcher.batches_run = batcher.items_run = 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "images_per_sec": len(images) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_batch": batcher.items_run / max(1, batcher.batches_run),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    model = AestheticVisionTransformer(pretrained=False).eval()
+    images = make_images(args.requests)
+
+    print(f"torch threads={torch.get_num_threads()} clients={args.clients} requests={args.requests}")
+    print(f"{'max_batch':>9} {'max_wait':>9} {'img/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+    for max_batch, max_wait in SETTINGS:
+        r = asyncio.run(run_setting(model, images, args.clients, max_batch, max_wait))
+        print(f"{max_batch:>9} {max_wait:>8.0f}ms {r['images_per_sec']:>8.1f} {r['p50_ms']:>8.0f} "
+              f"{r['p99_ms']:>8.0f} {r['mean_batch']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
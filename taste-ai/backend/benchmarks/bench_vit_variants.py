@@ -0,0 +1,98 @@
+"""Benchmark: accuracy vs. latency of the fp32, int8 and traced ViT exports.
+
+Runs every variant of one exported artifact (see app.ml.export) over the
+same image set. Reports per-image latency at batch size 1, batched
+throughput per core, and score deltas against fp32. Without --version the
+architecture is exported with random weights to a temporary directory, so
+no snapshot or network is needed.
+
+Usage (from taste-ai/backend):
+    python -m benchmarks.bench_vit_variants [--images 32] [--batch 8] [--threads 1]
+        [--version V [--model-dir DIR]] [--image-dir DIR]
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+import numpy as np
+import torch
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.ml.models import AestheticVisionTransformer
+from app.ml.batching import prepare_image, to_batch_tensor
+from app.ml.export import VARIANTS, export_artifacts, load_variant, resolve_version
+
+def load_images(count: int, image_dir: str = None, seed: int = 0):
+    if image_dir:
+        names = sorted(n for n in os.listdir(image_dir) if n.lower().endswith(('.jpg', '.jpeg', '.png')))
+        return [Image.open(os.path.join(image_dir, n)).convert('RGB') for n in names[:count]]
+    rng = np.random.default_rng(seed)
+    return [Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)) for _ in range(count)]
+
+def score(model, batch: torch.Tensor) -> np.ndarray:
+    with torch.no_grad():
+        return model(batch).reshape(len(batch), -1)[:, 0].numpy()
+
+def run_variant(model, tensors: torch.Tensor, batch_size: int):
+    score(model, tensors[:batch_size])  # warm-up (and TorchScript profiling runs)
+    score(model, tensors[:1])
+
+    latencies, scores = [], []
+    for i in range(len(tensors)):
+        start = time.perf_counter()
+        scores.append(score(model, tensors[i:i + 1])[0])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(tensors), batch_size):
+        score(model, tensors[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return np.array(scores), {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "images_per_sec": len(tensors) / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--image-dir", default=None)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--model-dir", default=settings.model_dir)
+    parser.add_argument("--version", default=None)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    if args.version:
+        path = resolve_version(args.model_dir, args.version)
+    else:
+        torch.manual_seed(0)
+        path = export_artifacts(AestheticVisionTransformer(pretrained=False), tempfile.mkdtemp(),
+                                "bench", source="random")
+
+    images = load_images(args.images, args.image_dir)
+    tensors = to_batch_tensor([prepare_image(img) for img in images])
+
+    print(f"artifact={path} torch threads={torch.get_num_threads()} images={len(images)} batch={args.batch}")
+    print(f"{'variant':>8} {'p50 ms':>8} {'p99 ms':>8} {'img/s/core':>11} {'speedup':>8} "
+          f"{'max |d|':>8} {'mean |d|':>9} {'rank corr':>10}")
+    reference, baseline = None, None
+    for variant in VARIANTS:
+        scores, r = run_variant(load_variant(path, variant), tensors, args.batch)
+        if reference is None:
+            reference, baseline = scores, r["images_per_sec"]
+        delta = np.abs(scores - reference)
+        rank_corr = np.corrcoef(np.argsort(np.argsort(scores)), np.argsort(np.argsort(reference)))[0, 1]
+        print(f"{variant:>8} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['images_per_sec'] / args.threads:>11.2f} {r['images_per_sec'] / baseline:>7.2f}x "
+              f"{delta.max():>8.4f} {delta.mean():>9.4f} {rank_corr:>10.3f}")
+
+if __name__ == "__main__":
+    main()
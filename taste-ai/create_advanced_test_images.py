@@ -103,8 +103,8 @@ def create_product_images():
     draw.rectangle([120, 180, 280, 220], fill='#DAA520', outline='#B8860B', width=2)
     
     # Handle
-    draw.ellipse([150, 120, 170, 200], fill='none', outline='#8B4513', width=8)
-    draw.ellipse([230, 120, 250, 200], fill='none', outline='#8B4513', width=8)
+    draw.ellipse([150, 120, 170, 200], fill=None, outline='#8B4513', width=8)
+    draw.ellipse([230, 120, 250, 200], fill=None, outline='#8B4513', width=8)
     
     # Hardware details
     draw.ellipse([190, 240, 210, 260], fill='#FFD700', outline='#DAA520', width=1)
@@ -104,17 +104,32 @@ class AdaptiveModelEngine:
         await self.create_initial_model_population(total_features)
     
     async def extract_all_discovered_patterns(self):
+        # The real-time processor stores validated patterns as hashes; keys it
+        # has not rewritten yet are still JSON strings
         patterns = []
-        pattern_keys = self.pattern_redis.keys('validated_pattern:*')
-        
-        for key in pattern_keys:
-            pattern_data = self.pattern_redis.get(key)
-            if pattern_data:
+        cursor = 0
+        while True:
+            cursor, keys = self.pattern_redis.scan(cursor=cursor, match='validated_pattern:*', count=1000)
+            pipe = self.pattern_redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.hgetall(key)
+            
+            for key, fields in zip(keys, pipe.execute(raise_on_error=False) if keys else []):
                 try:
-                    pattern = json.loads(pattern_data)
-                    patterns.append(pattern)
-                except:
+                    if isinstance(fields, redis.ResponseError):
+                        pattern_data = self.pattern_redis.get(key)
+                        if pattern_data:
+                            patterns.append(json.loads(pattern_data))
+                    elif fields:
+                        pattern = {field.decode(): value.decode() for field, value in fields.items()}
+                        pattern['validation_score'] = float(pattern.get('validation_score', 0.0))
+                        pattern['occurrences'] = int(pattern.get('occurrences', 0))
+                        patterns.append(pattern)
+                except (redis.RedisError, ValueError):
                     continue
+            
+            if cursor == 0:
+                break
         
         return patterns
     
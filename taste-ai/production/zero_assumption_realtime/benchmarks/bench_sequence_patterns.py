@@ -0,0 +1,123 @@
+"""Benchmark: extract_sequence_patterns before (Python slicing) and after (count_ngrams).
+
+Runs both on captured discovery payloads (the string values the real-time
+processor ingests), checks that they emit the same patterns, and reports
+per-item latency percentiles and total throughput by payload size.
+
+Capture payloads from the discovery Redis first (SCAN, sampled per DB):
+
+    python3 bench_sequence_patterns.py --capture payloads.jsonl.gz [--limit 2000]
+
+then benchmark them:
+
+    python3 bench_sequence_patterns.py --payloads payloads.jsonl.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'engines'))
+
+from ngram_counter import SEQUENCE_LENGTHS, count_ngrams
+
+REDIS_PORT = 6381
+SOURCE_DBS = range(10)
+SIZE_BUCKETS = [(0, 1024), (1024, 8192), (8192, 65536), (65536, None)]
+
+def legacy_sequence_patterns(data):
+    """The original extract_sequence_patterns loop"""
+    patterns = []
+    for length in range(2, 6):
+        sequences = []
+        for i in range(len(data) - length + 1):
+            sequence = data[i:i+length]
+            if sequence.isalnum():
+                sequences.append(sequence)
+        seq_freq = Counter(sequences)
+        for sequence, freq in seq_freq.items():
+            if freq > 1:
+                patterns.append({'type': f'sequence_{length}', 'pattern': sequence, 'frequency': freq})
+    return patterns
+
+def vectorized_sequence_patterns(data):
+    patterns = []
+    for length, (sequences, frequencies) in count_ngrams(data, SEQUENCE_LENGTHS, min_count=2).items():
+        for sequence, freq in zip(sequences, frequencies.tolist()):
+            patterns.append({'type': f'sequence_{length}', 'pattern': sequence, 'frequency': freq})
+    return patterns
+
+def capture(path, limit):
+    import redis
+
+    payloads = []
+    per_db = max(1, limit // len(SOURCE_DBS))
+    for db in SOURCE_DBS:
+        client = redis.Redis(host='localhost', port=REDIS_PORT, db=db)
+        taken = 0
+        for key in client.scan_iter(count=1000):
+            try:
+                value = client.get(key)
+                if value:
+                    payloads.append(value.decode('utf-8'))
+                    taken += 1
+            except Exception:
+                continue
+            if taken >= per_db:
+                break
+    with gzip.open(path, 'wt') as f:
+        for payload in payloads:
+            f.write(json.dumps(payload) + '\n')
+    print(f"✅ Captured {len(payloads)} payloads to {path}")
+
+def load(path):
+    with gzip.open(path, 'rt') as f:
+        return [json.loads(line) for line in f]
+
+def time_each(function, payloads):
+    seconds = []
+    for payload in payloads:
+        start = time.perf_counter()
+        function(payload)
+        seconds.append(time.perf_counter() - start)
+    return np.array(seconds)
+
+def canonical(patterns):
+    return sorted((p['type'], p['pattern'], p['frequency']) for p in patterns)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--capture', help='write payloads sampled from Redis to this .jsonl.gz')
+    parser.add_argument('--limit', type=int, default=2000)
+    parser.add_argument('--payloads', help='captured payloads (.jsonl.gz) to benchmark')
+    args = parser.parse_args()
+
+    if args.capture:
+        capture(args.capture, args.limit)
+        return
+    if not args.payloads:
+        parser.error('pass --payloads (capture some with --capture first)')
+
+    payloads = load(args.payloads)
+    mismatches = sum(canonical(legacy_sequence_patterns(p)) != canonical(vectorized_sequence_patterns(p))
+                     for p in payloads)
+    print(f"{len(payloads)} payloads, {sum(map(len, payloads)):,} characters, {mismatches} mismatching outputs")
+
+    print(f"{'size (chars)':>16} {'items':>6} {'legacy p50 (ms)':>16} {'new p50 (ms)':>13} "
+          f"{'legacy total (s)':>17} {'new total (s)':>14} {'speedup':>8}")
+    for low, high in SIZE_BUCKETS:
+        bucket = [p for p in payloads if len(p) >= low and (high is None or len(p) < high)]
+        if not bucket:
+            continue
+        legacy = time_each(legacy_sequence_patterns, bucket)
+        fast = time_each(vectorized_sequence_patterns, bucket)
+        label = f"{low}-{high}" if high else f"{low}+"
+        print(f"{label:>16} {len(bucket):>6} {np.median(legacy) * 1000:>16.2f} {np.median(fast) * 1000:>13.2f} "
+              f"{legacy.sum():>17.2f} {fast.sum():>14.2f} {legacy.sum() / fast.sum():>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import numpy as np
+from collections import Counter
+
+SEQUENCE_LENGTHS = (2, 3, 4, 5)
+# Packed keys must fit an int64
+KEY_BITS = 63
+
+def count_ngrams(text, lengths=SEQUENCE_LENGTHS, min_count=1):
+    """Count the all-alphanumeric character n-grams of `text` for several n.
+
+    Returns {n: (grams, counts)} with grams sorted by their packed key.
+    Equivalent to counting every `text[i:i+n]` for which `.isalnum()` is
+    true, but vectorized: the text is mapped to dense per-item character
+    codes once, each n-gram becomes one integer key (its codes packed
+    into `bits` bits each, read through a strided window view), and
+    np.unique counts the valid keys. Python only runs per distinct
+    character and per distinct n-gram emitted.
+    """
+    result = {n: ([], np.zeros(0, dtype=np.int64)) for n in lengths}
+    if not text or len(text) < min(lengths):
+        return result
+    try:
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    except UnicodeEncodeError:
+        return {n: _count_ngrams_python(text, n, min_count) for n in lengths}
+
+    alphabet, codes = np.unique(codepoints, return_inverse=True)
+    codes = codes.astype(np.int64)
+    bits = max(1, (len(alphabet) - 1).bit_length())
+
+    # Windows containing a non-alphanumeric character are skipped
+    alnum = np.array([chr(c).isalnum() for c in alphabet.tolist()])
+    non_alnum_before = np.concatenate(([0], np.cumsum(~alnum[codes])))
+
+    for n in lengths:
+        if len(codes) < n:
+            continue
+        if n * bits > KEY_BITS:
+            result[n] = _count_ngrams_python(text, n, min_count)
+            continue
+
+        shifts = np.arange(n - 1, -1, -1, dtype=np.int64) * bits
+        windows = np.lib.stride_tricks.sliding_window_view(codes, n)
+        valid = non_alnum_before[n:] == non_alnum_before[:-n]
+        keys, counts = np.unique((windows[valid] << shifts).sum(axis=1), return_counts=True)
+        if min_count > 1:
+            keep = counts >= min_count
+            keys, counts = keys[keep], counts[keep]
+
+        # Unpack the keys back to code points and slice one string into grams
+        chars = alphabet[(keys[:, None] >> shifts) & ((1 << bits) - 1)]
+        joined = chars.astype(np.uint32).tobytes().decode('utf-32-le')
+        result[n] = ([joined[i:i + n] for i in range(0, len(joined), n)], counts)
+
+    return result
+
+def _count_ngrams_python(text, n, min_count):
+    counts = Counter(text[i:i + n] for i in range(len(text) - n + 1) if text[i:i + n].isalnum())
+    grams = sorted(gram for gram, count in counts.items() if count >= min_count)
+    return grams, np.array([counts[gram] for gram in grams], dtype=np.int64)
+
+class NGramCounter:
+    """Streaming n-gram counts merged across many texts"""
+
+    def __init__(self, lengths=SEQUENCE_LENGTHS):
+        self.lengths = tuple(lengths)
+        self.counts = {n: Counter() for n in self.lengths}
+        self.items = 0
+
+    def update(self, text):
+        for n, (grams, counts) in count_ngrams(text, self.lengths).items():
+            self.counts[n].update(dict(zip(grams, counts.tolist())))
+        self.items += 1
+
+    def most_common(self, n, k=None):
+        return self.counts[n].most_common(k)
+
+    def merge(self, other):
+        for n in self.lengths:
+            self.counts[n].update(other.counts.get(n, {}))
+        self.items += other.items
@@ -12,79 +12,700 @@ import logging
 from collections import defaultdict, deque, Counter
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
 import pickle
 import hashlib
+import heapq
 import re
+import signal
+import threading
+import time
+from ngram_counter import SEQUENCE_LENGTHS, count_ngrams
+
+REDIS_HOST = 'localhost'
+REDIS_PORT = 6381
+SOURCE_DBS = range(10)
+PROCESSOR_DB = 3
+
+# Keys the processor itself writes to its DB; re-ingesting them would feed
+# its own output back in on every write
+PROCESSOR_KEY_PREFIXES = (
+    'validated_pattern:', 'correlation:', 'model_param:', 'pattern_weight:',
+    'pattern_market_relevance:', 'previous_intelligence', 'pattern_threshold',
+    'processing_batch_size', 'ingest:', 'embedding:', 'pattern_counts:'
+)
+
+# Distinct values counted per pattern type (each costs ~200 bytes)
+PATTERN_COUNTER_CAPACITY = 10000
+PATTERN_SNAPSHOT_KEY = 'pattern_counts:snapshot'
+PATTERN_SNAPSHOT_SECONDS = 60
+
+# Write-behind buffer for validated patterns
+PATTERN_FLUSH_SECONDS = 2.0
+PATTERN_FLUSH_MAX_PENDING = 20000
+PATTERN_FLUSH_BATCH_SIZE = 500
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+class RedisChangeFeed:
+    """New or modified string keys across the source DBs, without KEYS sweeps.
+    
+    Live changes arrive as keyspace notifications (`K$`: string writes) on
+    one pub/sub connection and are queued per DB. Notifications are not
+    durable, so after a (re)start or a lost subscription each DB is swept
+    with SCAN, a few batches per poll, until its cursor wraps. If
+    notifications cannot be enabled, DBs are re-swept periodically instead.
+    The cursor of an unfinished sweep is kept in `ingest:sweep:<db>`; a
+    restart first finishes that sweep, then sweeps the DB again from the
+    start to catch keys before the cursor that changed while it was down
+    (cheap: unchanged values are dropped by their fingerprints).
+    
+    Every DB has a durable fingerprint table in the processor's DB
+    (`ingest:digests:<db>`, key -> MD5 of the last processed value), so a
+    key is only returned when its value differs from what was processed,
+    whether it was found by a notification or a sweep. Fingerprints are
+    written by commit() once the returned items have been processed;
+    rollback() requeues them instead.
+    """
+    
+    KEYSPACE_EVENTS = 'K$'
+    SCAN_BATCH = 1000
+    SCAN_BATCHES_PER_POLL = 20
+    FALLBACK_SWEEP_SECONDS = 60
+    
+    def __init__(self, source_dbs, state_redis, state_db, skip_prefixes, logger):
+        self.clients = {db: redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=db) for db in source_dbs}
+        self.state_redis = state_redis
+        self.state_db = state_db
+        self.skip_prefixes = tuple(prefix.encode() for prefix in skip_prefixes)
+        self.logger = logger
+        
+        self.pending = defaultdict(set)
+        self.pending_lock = threading.Lock()
+        self.listener = None
+        self.sweep_cursors = {}
+        self.resumed_sweeps = set()
+        self.last_sweep = {}
+        self.uncommitted = defaultdict(dict)
+    
+    def start(self):
+        # Subscribe before sweeping so nothing written in between is missed
+        self.subscribe()
+        for db in self.clients:
+            self.sweep_cursors[db] = self.stored_cursor(db)
+            if self.sweep_cursors[db]:
+                self.resumed_sweeps.add(db)
+    
+    def stored_cursor(self, db):
+        """Where an unfinished sweep of `db` stopped (0: start a new sweep)"""
+        try:
+            cursor = self.state_redis.hget(f'ingest:sweep:{db}', 'cursor')
+        except redis.RedisError as e:
+            self.logger.warning(f"Could not read sweep cursor of DB {db}: {e}")
+            return 0
+        if cursor is not None:
+            self.logger.info(f"Resuming sweep of DB {db} at cursor {int(cursor)}")
+        return int(cursor) if cursor is not None else 0
+    
+    def subscribe(self):
+        try:
+            client = self.clients[min(self.clients)]
+            flags = client.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+            missing = [flag for flag in self.KEYSPACE_EVENTS
+                       if flag not in flags and not (flag == '$' and 'A' in flags)]
+            if missing:
+                client.config_set('notify-keyspace-events', flags + ''.join(missing))
+            
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(**{f'__keyspace@{db}__:*': self.on_keyspace_event for db in self.clients})
+            self.listener = pubsub.run_in_thread(sleep_time=0.1, daemon=True)
+        except Exception as e:
+            self.listener = None
+            self.logger.warning(f"Keyspace notifications unavailable, using periodic sweeps: {e}")
+    
+    def on_keyspace_event(self, message):
+        prefix, _, key = message['channel'].partition(b'__:')
+        db = int(prefix[len(b'__keyspace@'):])
+        if self.should_skip(db, key):
+            return
+        with self.pending_lock:
+            self.pending[db].add(key)
+    
+    def should_skip(self, db, key):
+        return db == self.state_db and key.startswith(self.skip_prefixes)
+    
+    def poll(self):
+        if self.listener is not None and not self.listener.is_alive():
+            self.logger.warning("Keyspace listener stopped; resubscribing and sweeping for missed changes")
+            self.subscribe()
+            for db in self.clients:
+                self.sweep_cursors.setdefault(db, 0)
+        elif self.listener is None:
+            now = time.monotonic()
+            for db in self.clients:
+                if db not in self.sweep_cursors and now - self.last_sweep.get(db, 0) >= self.FALLBACK_SWEEP_SECONDS:
+                    self.sweep_cursors[db] = 0
+        
+        data_items = []
+        for db, client in self.clients.items():
+            try:
+                with self.pending_lock:
+                    keys = self.pending.pop(db, set())
+                if db in self.sweep_cursors:
+                    keys |= self.scan(db, client)
+                if keys:
+                    data_items.extend(self.fetch_changed(db, client, keys))
+            except redis.RedisError as e:
+                self.logger.error(f"Change feed error on DB {db}: {e}")
+        return data_items
+    
+    def scan(self, db, client):
+        cursor = self.sweep_cursors[db]
+        keys = set()
+        for _ in range(self.SCAN_BATCHES_PER_POLL):
+            cursor, batch = client.scan(cursor=cursor, count=self.SCAN_BATCH)
+            keys.update(batch)
+            if cursor == 0 and db in self.resumed_sweeps:
+                # Only the tail was swept; the head may have changed meanwhile
+                self.resumed_sweeps.discard(db)
+                self.sweep_cursors[db] = 0
+                self.state_redis.hset(f'ingest:sweep:{db}', 'cursor', 0)
+                break
+            if cursor == 0:
+                del self.sweep_cursors[db]
+                self.last_sweep[db] = time.monotonic()
+                # No cursor stored means no sweep to resume
+                pipe = self.state_redis.pipeline(transaction=False)
+                pipe.hdel(f'ingest:sweep:{db}', 'cursor')
+                pipe.hset(f'ingest:sweep:{db}', 'completed', datetime.now().isoformat())
+                pipe.execute()
+                break
+        else:
+            self.sweep_cursors[db] = cursor
+            self.state_redis.hset(f'ingest:sweep:{db}', 'cursor', cursor)
+        return keys
+    
+    def fetch_changed(self, db, client, keys):
+        keys = [key for key in keys if not self.should_skip(db, key)]
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+        values = pipe.execute(raise_on_error=False)
+        processed = self.state_redis.hmget(f'ingest:digests:{db}', keys) if keys else []
+        
+        data_items = []
+        for key, value, processed_digest in zip(keys, values, processed):
+            # Deleted, or not a string value
+            if value is None or isinstance(value, Exception):
+                if processed_digest is not None:
+                    self.uncommitted[db][key] = None
+                continue
+            digest = hashlib.md5(value).hexdigest()
+            if processed_digest is not None and processed_digest.decode() == digest:
+                continue
+            self.uncommitted[db][key] = digest
+            try:
+                data_items.append({
+                    'source_db': db,
+                    'key': key.decode('utf-8'),
+                    'data': value.decode('utf-8'),
+                    'timestamp': datetime.now().isoformat()
+                })
+            except UnicodeDecodeError:
+                continue
+        return data_items
+    
+    def commit(self):
+        for db, digests in self.uncommitted.items():
+            changed = {key: digest for key, digest in digests.items() if digest is not None}
+            deleted = [key for key, digest in digests.items() if digest is None]
+            pipe = self.state_redis.pipeline(transaction=False)
+            if changed:
+                pipe.hset(f'ingest:digests:{db}', mapping=changed)
+            if deleted:
+                pipe.hdel(f'ingest:digests:{db}', *deleted)
+            pipe.execute()
+        self.uncommitted.clear()
+    
+    def rollback(self):
+        with self.pending_lock:
+            for db, digests in self.uncommitted.items():
+                self.pending[db].update(digests)
+        self.uncommitted.clear()
+
+class SpaceSavingCounter:
+    """Top-`capacity` frequent items of a stream in bounded memory (Space-Saving).
+    
+    At most `capacity` items are monitored. An unmonitored item replaces
+    the one with the smallest count and inherits that count as its error.
+    After `total` additions, for every item:
+    
+        estimate(x) - error(x) <= true count of x <= estimate(x)
+        error(x) <= total / capacity
+    
+    Any item seen more than total / capacity times is always monitored;
+    for unmonitored items estimate() is 0 and the true count is at most
+    the smallest monitored count (also <= total / capacity).
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # Lazy min-heap of (count, item); entries whose count is stale are skipped
+        self.heap = []
+    
+    def __len__(self):
+        return len(self.counts)
+    
+    def add(self, item, amount=1):
+        self.total += amount
+        if item in self.counts:
+            self.counts[item] += amount
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = amount
+            self.errors[item] = 0
+        else:
+            floor, evicted = self.pop_min()
+            del self.counts[evicted], self.errors[evicted]
+            self.counts[item] = floor + amount
+            self.errors[item] = floor
+        
+        heapq.heappush(self.heap, (self.counts[item], item))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self.heap)
+        return self.counts[item]
+    
+    def pop_min(self):
+        while True:
+            count, item = heapq.heappop(self.heap)
+            if self.counts.get(item) == count:
+                return count, item
+    
+    def estimate(self, item):
+        return self.counts.get(item, 0)
+    
+    def guaranteed(self, item):
+        return self.counts.get(item, 0) - self.errors.get(item, 0)
+    
+    def top(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda entry: entry[1])
+    
+    def to_dict(self):
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'items': [[item, count, self.errors[item]] for item, count in self.counts.items()]
+        }
+    
+    @classmethod
+    def from_dict(cls, data, capacity):
+        counter = cls(capacity)
+        counter.total = data.get('total', 0)
+        items = sorted(data.get('items', []), key=lambda entry: entry[1], reverse=True)
+        for item, count, error in items[:counter.capacity]:
+            counter.counts[item] = count
+            counter.errors[item] = error
+        counter.heap = [(count, item) for item, count in counter.counts.items()]
+        heapq.heapify(counter.heap)
+        return counter
+
+class PatternFrequencyStore:
+    """Bounded occurrence counts per pattern type, snapshotted to Redis.
+    
+    One SpaceSavingCounter per type, so memory is at most
+    `capacity` * (number of types) entries however many distinct words,
+    substrings and domains stream through; see SpaceSavingCounter for the
+    error bounds of the counts.
+    """
+    
+    def __init__(self, capacity=PATTERN_COUNTER_CAPACITY):
+        self.capacity = capacity
+        self.counters = {}
+    
+    def __len__(self):
+        return len(self.counters)
+    
+    def keys(self):
+        return self.counters.keys()
+    
+    def counter(self, pattern_type):
+        if pattern_type not in self.counters:
+            self.counters[pattern_type] = SpaceSavingCounter(self.capacity)
+        return self.counters[pattern_type]
+    
+    def add(self, pattern_type, pattern_value):
+        return self.counter(pattern_type).add(pattern_value)
+    
+    def estimate(self, pattern_type, pattern_value):
+        counter = self.counters.get(pattern_type)
+        return counter.estimate(pattern_value) if counter else 0
+    
+    def guaranteed(self, pattern_type, pattern_value):
+        counter = self.counters.get(pattern_type)
+        return counter.guaranteed(pattern_value) if counter else 0
+    
+    def snapshot(self, redis_client):
+        data = {pattern_type: counter.to_dict() for pattern_type, counter in self.counters.items()}
+        redis_client.set(PATTERN_SNAPSHOT_KEY, json.dumps(data))
+    
+    def restore(self, redis_client):
+        raw = redis_client.get(PATTERN_SNAPSHOT_KEY)
+        if not raw:
+            return 0
+        data = json.loads(raw)
+        self.counters = {
+            pattern_type: SpaceSavingCounter.from_dict(counter, self.capacity)
+            for pattern_type, counter in data.items()
+        }
+        return sum(len(counter) for counter in self.counters.values())
+
+class PatternWriteBehindBuffer:
+    """Coalesces validated-pattern writes and applies them in pipelined batches.
+    
+    Each pattern is a Redis hash `validated_pattern:<type>:<md5>` holding
+    type, pattern, validation_score and last_seen (HSET, latest value
+    wins) and occurrences (HINCRBY by the number of records since the last
+    flush). However often a pattern is recorded within a flush window, it
+    costs one HINCRBY and one HSET, sent `batch_size` patterns per
+    pipeline round-trip.
+    
+    flush() runs when `max_pending` distinct patterns are buffered, every
+    `flush_seconds` from the processor's flush loop, and on shutdown. A
+    batch that fails to write is merged back into the buffer and retried
+    on the next flush. Keys still holding the old JSON string format are
+    converted on first write, keeping their stored occurrences.
+    """
+    
+    def __init__(self, redis_client, max_pending=PATTERN_FLUSH_MAX_PENDING,
+                 batch_size=PATTERN_FLUSH_BATCH_SIZE):
+        self.redis_client = redis_client
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.pending = {}
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def pattern_key(pattern_type, pattern_value):
+        return f"validated_pattern:{pattern_type}:{hashlib.md5(pattern_value.encode()).hexdigest()}"
+    
+    def record(self, pattern_type, pattern_value, validation_score):
+        with self.lock:
+            entry = self.pending.get((pattern_type, pattern_value))
+            if entry is None:
+                entry = self.pending[(pattern_type, pattern_value)] = {'occurrences': 0}
+            entry['occurrences'] += 1
+            entry['validation_score'] = validation_score
+            entry['last_seen'] = datetime.now().isoformat()
+            full = len(self.pending) >= self.max_pending
+        if full:
+            self.flush()
+    
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        items = list(pending.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            try:
+                self.write_batch(batch)
+            except redis.RedisError:
+                self.requeue(items[start:])
+                raise
+        return len(items)
+    
+    def write_batch(self, batch):
+        pipe = self.redis_client.pipeline(transaction=False)
+        for (pattern_type, pattern_value), entry in batch:
+            key = self.pattern_key(pattern_type, pattern_value)
+            pipe.hincrby(key, 'occurrences', entry['occurrences'])
+            pipe.hset(key, mapping={
+                'type': pattern_type,
+                'pattern': pattern_value,
+                'validation_score': entry['validation_score'],
+                'last_seen': entry['last_seen']
+            })
+        results = pipe.execute(raise_on_error=False)
+        
+        legacy = [item for item, result in zip(batch, results[::2]) if isinstance(result, redis.ResponseError)]
+        if legacy:
+            self.convert_legacy(legacy)
+    
+    def convert_legacy(self, batch):
+        keys = [self.pattern_key(pattern_type, pattern_value) for (pattern_type, pattern_value), _ in batch]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+        stored = pipe.execute(raise_on_error=False)
+        
+        pipe = self.redis_client.pipeline(transaction=True)
+        for key, raw, ((pattern_type, pattern_value), entry) in zip(keys, stored, batch):
+            previous = 0
+            try:
+                previous = int(json.loads(raw).get('occurrences', 0))
+            except Exception:
+                pass
+            pipe.delete(key)
+            pipe.hset(key, mapping={
+                'type': pattern_type,
+                'pattern': pattern_value,
+                'validation_score': entry['validation_score'],
+                'occurrences': previous + entry['occurrences'],
+                'last_seen': entry['last_seen']
+            })
+        pipe.execute()
+    
+    def requeue(self, items):
+        with self.lock:
+            for pattern_id, entry in items:
+                newer = self.pending.get(pattern_id)
+                if newer is None:
+                    self.pending[pattern_id] = entry
+                else:
+                    newer['occurrences'] += entry['occurrences']
+
+class PatternEmbeddingStore:
+    """Memoized, L2-normalized float32 sentence embeddings of pattern strings.
+    
+    Each distinct string is encoded once: lookups hit an in-process dict,
+    then a Redis hash (`embedding:<model>`, MD5 of the text -> raw float32
+    bytes) that survives restarts, and only the remaining strings go to the
+    model, in one batched encode call.
+    """
+    
+    ENCODE_BATCH_SIZE = 256
+    
+    def __init__(self, model, redis_client, model_name):
+        self.model = model
+        self.redis_client = redis_client
+        self.key = f'embedding:{model_name}'
+        self.dimension = model.get_sentence_embedding_dimension()
+        self.vectors = {}
+    
+    def embed(self, texts):
+        texts = list(texts)
+        missing = list({text for text in texts if text not in self.vectors})
+        
+        if missing:
+            digests = [hashlib.md5(text.encode()).hexdigest() for text in missing]
+            stored = self.redis_client.hmget(self.key, digests) if self.redis_client else [None] * len(missing)
+            to_encode = []
+            for text, raw in zip(missing, stored):
+                if raw is not None and len(raw) == self.dimension * 4:
+                    self.vectors[text] = np.frombuffer(raw, dtype=np.float32)
+                else:
+                    to_encode.append(text)
+            
+            if to_encode:
+                encoded = self.model.encode(
+                    to_encode, batch_size=self.ENCODE_BATCH_SIZE,
+                    convert_to_numpy=True, normalize_embeddings=True
+                ).astype(np.float32)
+                for text, vector in zip(to_encode, encoded):
+                    self.vectors[text] = vector
+                if self.redis_client:
+                    self.redis_client.hset(self.key, mapping={
+                        hashlib.md5(text.encode()).hexdigest(): vector.tobytes()
+                        for text, vector in zip(to_encode, encoded)
+                    })
+        
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            # Empty strings keep a zero row: no semantic similarity
+            if text:
+                matrix[i] = self.vectors[text]
+        return matrix
+
+class PatternCorrelationEngine:
+    """All-pairs pattern correlation as blocked matrix products.
+    
+    correlation = 0.3 * type + 0.3 * frequency + 0.4 * semantic, where type
+    is 1.0 for the same pattern type and 0.5 otherwise, frequency is
+    min/max of the occurrence counts and semantic is the cosine of the
+    pattern strings' embeddings (0 for an empty string); pairs where
+    either pattern has no occurrences are 0. All three terms are computed
+    for a block of rows against every pattern at once, and only pairs above
+    the threshold are kept, at most `top_k` per row (the strongest), so
+    memory stays at one block however many patterns there are.
+    """
+    
+    BLOCK_ELEMENTS = 4_000_000
+    
+    def __init__(self, embedding_store, threshold=0.7, top_k=100):
+        self.embedding_store = embedding_store
+        self.threshold = threshold
+        self.top_k = top_k
+    
+    def correlate(self, patterns):
+        correlation_matrix = defaultdict(dict)
+        count = len(patterns)
+        if count < 2:
+            return correlation_matrix
+        
+        pattern_ids = [f"{pattern['type']}:{pattern['pattern']}" for pattern in patterns]
+        embeddings = self.embedding_store.embed(pattern.get('pattern', '') for pattern in patterns)
+        _, type_codes = np.unique([str(pattern.get('type')) for pattern in patterns], return_inverse=True)
+        occurrences = np.array([pattern.get('occurrences', 0) for pattern in patterns], dtype=np.float32)
+        active = occurrences > 0
+        
+        block_rows = max(1, self.BLOCK_ELEMENTS // count)
+        for start in range(0, count, block_rows):
+            rows = slice(start, min(count, start + block_rows))
+            
+            semantic = embeddings[rows] @ embeddings.T
+            same_type = type_codes[rows, None] == type_codes[None, :]
+            row_occurrences = occurrences[rows, None]
+            frequency = (np.minimum(row_occurrences, occurrences[None, :])
+                         / np.maximum(np.maximum(row_occurrences, occurrences[None, :]), 1.0))
+            
+            correlation = 0.4 * semantic + 0.3 * frequency + np.where(same_type, np.float32(0.3), np.float32(0.15))
+            correlation[~(active[rows, None] & active[None, :])] = 0.0
+            row_index = np.arange(correlation.shape[0])
+            correlation[row_index, row_index + start] = -np.inf
+            
+            if self.top_k and self.top_k < count - 1:
+                candidates = np.argpartition(-correlation, self.top_k, axis=1)[:, :self.top_k]
+            else:
+                candidates = np.broadcast_to(np.arange(count), correlation.shape)
+            values = np.take_along_axis(correlation, candidates, axis=1)
+            
+            for row, column in zip(*np.nonzero(values > self.threshold)):
+                i, j = start + row, candidates[row, column]
+                correlation_matrix[pattern_ids[i]][pattern_ids[j]] = float(values[row, column])
+        
+        return correlation_matrix
 
 class ZeroAssumptionRealTimeProcessor:
     def __init__(self):
-        self.redis_client = redis.Redis(host='localhost', port=6381, db=3)
-        self.discovery_redis = redis.Redis(host='localhost', port=6381, db=2)
-        self.learning_redis = redis.Redis(host='localhost', port=6381, db=0)
+        self.redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=PROCESSOR_DB)
+        self.discovery_redis = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=2)
+        self.learning_redis = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
         
-        self.sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
-        self.discovered_patterns = defaultdict(Counter)
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+        
+        self.change_feed = RedisChangeFeed(
+            SOURCE_DBS, self.redis_client, PROCESSOR_DB, PROCESSOR_KEY_PREFIXES, self.logger
+        )
+        
+        self.sentence_transformer = SentenceTransformer(EMBEDDING_MODEL)
+        self.embedding_store = PatternEmbeddingStore(self.sentence_transformer, self.redis_client, EMBEDDING_MODEL)
+        self.correlation_engine = PatternCorrelationEngine(self.embedding_store)
+        self.discovered_patterns = PatternFrequencyStore()
+        self.pattern_writes = PatternWriteBehindBuffer(self.redis_client)
         self.learned_correlations = defaultdict(float)
         self.processing_cycles = 0
         self.intelligence_growth_rate = 0.0
-        
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
     
     async def execute_zero_assumption_processing(self):
         self.logger.info("Starting zero assumption real-time processing")
+        self.change_feed.start()
         
-        await asyncio.gather(
-            self.discover_data_patterns(),
-            self.learn_correlation_networks(),
-            self.update_models_dynamically(),
-            self.measure_intelligence_growth(),
-            self.process_feedback_loops(),
-            self.evolve_processing_algorithms()
-        )
+        try:
+            restored = self.discovered_patterns.restore(self.redis_client)
+            self.logger.info(f"Restored {restored} pattern counts")
+        except Exception as e:
+            self.logger.error(f"Pattern count restore error: {e}")
+        
+        # SIGTERM cancels the processing tasks, so buffered writes are flushed below
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        
+        try:
+            await asyncio.gather(
+                self.discover_data_patterns(),
+                self.snapshot_pattern_counts(),
+                self.flush_pattern_writes(),
+                self.learn_correlation_networks(),
+                self.update_models_dynamically(),
+                self.measure_intelligence_growth(),
+                self.process_feedback_loops(),
+                self.evolve_processing_algorithms()
+            )
+        finally:
+            flushed = self.pattern_writes.flush()
+            self.logger.info(f"Flushed {flushed} buffered pattern writes on shutdown")
     
     async def discover_data_patterns(self):
         while True:
             try:
-                all_data = await self.extract_all_available_data()
+                changed_data = await self.extract_changed_data()
                 
-                for data_item in all_data:
+                for data_item in changed_data:
                     patterns = await self.extract_patterns_from_data(data_item)
                     await self.validate_patterns(patterns)
                     await self.store_validated_patterns(patterns)
                 
+                # Patterns must be in Redis before their inputs are marked processed
+                self.pattern_writes.flush()
+                self.change_feed.commit()
+                
                 await asyncio.sleep(5)
                 
             except Exception as e:
                 self.logger.error(f"Pattern discovery error: {e}")
+                self.change_feed.rollback()
                 await asyncio.sleep(30)
     
-    async def extract_all_available_data(self):
+    async def flush_pattern_writes(self):
+        while True:
+            await asyncio.sleep(PATTERN_FLUSH_SECONDS)
+            try:
+                self.pattern_writes.flush()
+            except Exception as e:
+                self.logger.error(f"Pattern write flush error: {e}")
+    
+    async def snapshot_pattern_counts(self):
+        while True:
+            await asyncio.sleep(PATTERN_SNAPSHOT_SECONDS)
+            try:
+                self.discovered_patterns.snapshot(self.redis_client)
+            except Exception as e:
+                self.logger.error(f"Pattern count snapshot error: {e}")
+    
+    async def extract_changed_data(self):
+        return self.change_feed.poll()
+    
+    async def extract_all_available_data(self, limit=None):
         data_items = []
         
-        for db_num in range(10):
+        for db_num, client in self.change_feed.clients.items():
             try:
-                temp_redis = redis.Redis(host='localhost', port=6381, db=db_num)
-                all_keys = temp_redis.keys('*')
-                
-                for key in all_keys:
-                    try:
-                        value = temp_redis.get(key)
-                        if value:
-                            data_items.append({
-                                'source_db': db_num,
-                                'key': key.decode('utf-8'),
-                                'data': value.decode('utf-8'),
-                                'timestamp': datetime.now().isoformat()
-                            })
-                    except:
-                        continue
+                # SCAN in batches: never blocks Redis the way KEYS * does
+                for keys in self.scan_key_batches(client):
+                    keys = [key for key in keys if not self.change_feed.should_skip(db_num, key)]
+                    pipe = client.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.get(key)
+                    
+                    for key, value in zip(keys, pipe.execute(raise_on_error=False)):
+                        try:
+                            if value and not isinstance(value, Exception):
+                                data_items.append({
+                                    'source_db': db_num,
+                                    'key': key.decode('utf-8'),
+                                    'data': value.decode('utf-8'),
+                                    'timestamp': datetime.now().isoformat()
+                                })
+                        except:
+                            continue
+                    
+                    if limit is not None and len(data_items) >= limit:
+                        return data_items[:limit]
             except:
                 continue
         
         return data_items
     
+    def scan_key_batches(self, client, match=None):
+        cursor = 0
+        while True:
+            cursor, keys = client.scan(cursor=cursor, match=match, count=RedisChangeFeed.SCAN_BATCH)
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
+    
     async def extract_patterns_from_data(self, data_item):
         patterns = []
         data_content = data_item.get('data', '')
@@ -175,21 +796,13 @@ class ZeroAssumptionRealTimeProcessor:
     async def extract_sequence_patterns(self, data):
         patterns = []
         
-        for length in range(2, 6):
-            sequences = []
-            for i in range(len(data) - length + 1):
-                sequence = data[i:i+length]
-                if sequence.isalnum():
-                    sequences.append(sequence)
-            
-            seq_freq = Counter(sequences)
-            for sequence, freq in seq_freq.items():
-                if freq > 1:
-                    patterns.append({
-                        'type': f'sequence_{length}',
-                        'pattern': sequence,
-                        'frequency': freq
-                    })
+        for length, (sequences, frequencies) in count_ngrams(data, SEQUENCE_LENGTHS, min_count=2).items():
+            for sequence, freq in zip(sequences, frequencies.tolist()):
+                patterns.append({
+                    'type': f'sequence_{length}',
+                    'pattern': sequence,
+                    'frequency': freq
+                })
         
         return patterns
     
@@ -240,7 +853,9 @@ class ZeroAssumptionRealTimeProcessor:
         pattern_type = pattern.get('type')
         pattern_value = pattern.get('pattern')
         
-        existing_count = self.discovered_patterns[pattern_type][pattern_value]
+        # Lower bound of the true count: never credits repetitions a value
+        # only inherited from the evicted entry it replaced
+        existing_count = self.discovered_patterns.guaranteed(pattern_type, pattern_value)
         frequency = pattern.get('frequency', 1)
         
         base_score = min(frequency / 100.0, 1.0)
@@ -257,19 +872,10 @@ class ZeroAssumptionRealTimeProcessor:
             pattern_value = pattern.get('pattern')
             validation_score = pattern.get('validation_score', 0.0)
             
-            self.discovered_patterns[pattern_type][pattern_value] += 1
+            self.discovered_patterns.add(pattern_type, pattern_value)
             
-            pattern_key = f"validated_pattern:{pattern_type}:{hashlib.md5(pattern_value.encode()).hexdigest()}"
-            
-            stored_data = {
-                'type': pattern_type,
-                'pattern': pattern_value,
-                'validation_score': validation_score,
-                'occurrences': self.discovered_patterns[pattern_type][pattern_value],
-                'last_seen': datetime.now().isoformat()
-            }
-            
-            self.redis_client.set(pattern_key, json.dumps(stored_data))
+            # Coalesced per pattern and written by the next flush
+            self.pattern_writes.record(pattern_type, pattern_value, validation_score)
     
     async def learn_correlation_networks(self):
         while True:
@@ -290,30 +896,29 @@ class ZeroAssumptionRealTimeProcessor:
     
     async def get_all_validated_patterns(self):
         patterns = []
-        pattern_keys = self.redis_client.keys('validated_pattern:*')
         
-        for key in pattern_keys:
-            pattern_data = self.redis_client.get(key)
-            if pattern_data:
-                pattern = json.loads(pattern_data)
-                patterns.append(pattern)
+        for keys in self.scan_key_batches(self.redis_client, 'validated_pattern:*'):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.hgetall(key)
+            
+            for key, fields in zip(keys, pipe.execute(raise_on_error=False)):
+                if isinstance(fields, redis.ResponseError):
+                    # Not yet converted from the JSON string format
+                    pattern_data = self.redis_client.get(key)
+                    if pattern_data:
+                        patterns.append(json.loads(pattern_data))
+                elif fields:
+                    pattern = {field.decode(): value.decode() for field, value in fields.items()}
+                    pattern['validation_score'] = float(pattern.get('validation_score', 0.0))
+                    pattern['occurrences'] = int(pattern.get('occurrences', 0))
+                    patterns.append(pattern)
         
         return patterns
     
     async def build_correlation_matrix(self, patterns):
-        correlation_matrix = defaultdict(lambda: defaultdict(float))
-        
-        for i, pattern1 in enumerate(patterns):
-            for j, pattern2 in enumerate(patterns):
-                if i != j:
-                    correlation = await self.calculate_pattern_correlation(pattern1, pattern2)
-                    
-                    pattern1_id = f"{pattern1['type']}:{pattern1['pattern']}"
-                    pattern2_id = f"{pattern2['type']}:{pattern2['pattern']}"
-                    
-                    correlation_matrix[pattern1_id][pattern2_id] = correlation
-        
-        return correlation_matrix
+        # Sparse: only pairs above the strong-correlation threshold
+        return await asyncio.to_thread(self.correlation_engine.correlate, patterns)
     
     async def calculate_pattern_correlation(self, pattern1, pattern2):
         occurrences1 = pattern1.get('occurrences', 0)
@@ -333,10 +938,9 @@ class ZeroAssumptionRealTimeProcessor:
         pattern2_str = pattern2.get('pattern', '')
         
         if pattern1_str and pattern2_str:
-            embedding1 = self.sentence_transformer.encode([pattern1_str])
-            embedding2 = self.sentence_transformer.encode([pattern2_str])
+            embedding1, embedding2 = self.embedding_store.embed([pattern1_str, pattern2_str])
             
-            semantic_correlation = cosine_similarity(embedding1, embedding2)[0][0]
+            semantic_correlation = float(embedding1 @ embedding2)
         else:
             semantic_correlation = 0.0
         
@@ -404,10 +1008,9 @@ class ZeroAssumptionRealTimeProcessor:
     async def calculate_data_volume(self):
         total_keys = 0
         
-        for db_num in range(10):
+        for client in self.change_feed.clients.values():
             try:
-                temp_redis = redis.Redis(host='localhost', port=6381, db=db_num)
-                db_keys = temp_redis.dbsize()
+                db_keys = client.dbsize()
                 total_keys += db_keys
             except:
                 continue
@@ -560,20 +1163,18 @@ class ZeroAssumptionRealTimeProcessor:
     async def identify_patterns_affected_by_feedback(self, content):
         affected_patterns = []
         
-        content_embedding = self.sentence_transformer.encode([content])
+        all_patterns = [pattern for pattern in await self.get_all_validated_patterns() if pattern.get('pattern')]
+        if not all_patterns:
+            return affected_patterns
         
-        all_patterns = await self.get_all_validated_patterns()
+        content_embedding = self.embedding_store.embed([content])[0]
+        pattern_embeddings = self.embedding_store.embed(pattern['pattern'] for pattern in all_patterns)
+        similarities = pattern_embeddings @ content_embedding
         
-        for pattern in all_patterns:
-            pattern_text = pattern.get('pattern', '')
-            
-            if pattern_text:
-                pattern_embedding = self.sentence_transformer.encode([pattern_text])
-                similarity = cosine_similarity(content_embedding, pattern_embedding)[0][0]
-                
-                if similarity > 0.3:
-                    pattern_id = f"{pattern['type']}:{pattern['pattern']}"
-                    affected_patterns.append(pattern_id)
+        for pattern, similarity in zip(all_patterns, similarities):
+            if similarity > 0.3:
+                pattern_id = f"{pattern['type']}:{pattern['pattern']}"
+                affected_patterns.append(pattern_id)
         
         return affected_patterns
     
@@ -729,8 +1330,7 @@ class ZeroAssumptionRealTimeProcessor:
         
         self.redis_client.set(variation['parameter'], str(variation['value']))
         
-        test_data = await self.extract_all_available_data()
-        limited_test_data = test_data[:50]
+        limited_test_data = await self.extract_all_available_data(limit=50)
         
         for data_item in limited_test_data:
             await self.extract_patterns_from_data(data_item)
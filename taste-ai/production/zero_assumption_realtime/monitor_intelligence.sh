@@ -8,10 +8,10 @@ while true; do
     INTELLIGENCE=$(redis-cli -p 6381 -n 3 GET previous_intelligence 2>/dev/null || echo "0.0000")
     echo "Current Intelligence Level: $INTELLIGENCE"
     
-    PATTERNS=$(redis-cli -p 6381 -n 3 KEYS "validated_pattern:*" | wc -l 2>/dev/null || echo "0")
+    PATTERNS=$(redis-cli -p 6381 -n 3 --scan --pattern "validated_pattern:*" | wc -l 2>/dev/null || echo "0")
     echo "Discovered Patterns: $PATTERNS"
     
-    CORRELATIONS=$(redis-cli -p 6381 -n 3 KEYS "correlation:*" | wc -l 2>/dev/null || echo "0")
+    CORRELATIONS=$(redis-cli -p 6381 -n 3 --scan --pattern "correlation:*" | wc -l 2>/dev/null || echo "0")
     echo "Learned Correlations: $CORRELATIONS"
     
     CYCLES=$(redis-cli -p 6381 -n 3 LLEN intelligence_growth_history 2>/dev/null || echo "0")